@@ -20,6 +20,9 @@ with open(RULES_FILE, 'r', encoding='utf-8') as f:
 
 def create_mutant(mutant_name: str, original: str, replacement: str) -> None:
     """Create a mutant file with the given replacement."""
+    if original not in original_content:
+        # A stale anchor would silently write an unmutated copy of rules.py
+        raise ValueError(f"anchor not found in rules.py: {original!r}")
     mutant_content = original_content.replace(original, replacement, 1)
     mutant_file = MUTANTS_DIR / f"rules_{mutant_name}.py"
     with open(mutant_file, 'w', encoding='utf-8') as f:
@@ -28,15 +31,15 @@ def create_mutant(mutant_name: str, original: str, replacement: str) -> None:
 
 # Mutation 1: Change speed comparison operator
 try:
-    original = 'if speed > current_max_speed + 1e-9:  # Add small epsilon for floating point comparison'
-    replacement = 'if speed >= current_max_speed:  # Mutant: Changed > to >='
+    original = 'if speed > speeding_above:'
+    replacement = 'if speed >= speed_limit:  # Mutant: Changed > to >='
     create_mutant("speed_ge", original, replacement)
 except Exception as e:
     print(f"Error creating speed_ge mutant: {e}")
 
 # Mutation 2: Change follow distance comparison
 try:
-    original = 'if dist < min_follow - 1e-9:  # Add small epsilon for floating point comparison'
+    original = 'if dist < too_close_below:'
     replacement = 'if dist <= min_follow:  # Mutant: Changed < to <='
     create_mutant("dist_le", original, replacement)
 except Exception as e:
@@ -44,15 +47,15 @@ except Exception as e:
 
 # Mutation 3: Change rolling stop speed threshold
 try:
-    original = 'if stop_sign_time is not None and speed > 1.0 + 1e-9:'
-    replacement = 'if stop_sign_time is not None and speed > 2.0:  # Mutant: Changed 1.0 to 2.0'
+    original = 'if speed > 1.0 + 1e-9:'
+    replacement = 'if speed > 2.0:  # Mutant: Changed 1.0 to 2.0'
     create_mutant("stop_speed_2", original, replacement)
 except Exception as e:
     print(f"Error creating stop_speed_2 mutant: {e}")
 
 # Mutation 4: Change stop sign wait time check
 try:
-    original = 'if time_since_stop < stop_wait - 1e-9:  # Add small epsilon for floating point comparison'
+    original = 'if time_since_stop < rolling_below:'
     replacement = 'if time_since_stop < stop_wait + 1.0:  # Mutant: Added 1.0 to stop_wait'
     create_mutant("stop_wait_plus_1", original, replacement)
 except Exception as e:
@@ -60,7 +63,7 @@ except Exception as e:
 
 # Mutation 5: Change lane change follow distance check
 try:
-    original = 'if last_follow_dist < min_follow - 1e-9:  # Add small epsilon for floating point comparison'
+    original = 'if last_follow_dist < too_close_below:'
     replacement = 'if last_follow_dist < min_follow + 1.0:  # Mutant: Added 1.0 to min_follow'
     create_mutant("lane_change_dist_plus_1", original, replacement)
 except Exception as e:
@@ -85,8 +88,8 @@ except Exception as e:
 # Mutation 8: Change sorting order
 # This one should be killed by tests that check violation ordering
 try:
-    original = 'violations.sort(key=lambda v: v[\'time\'])'
-    replacement = 'violations.sort(key=lambda v: v[\'time\'], reverse=True)  # Mutant: Reversed sort order'
+    original = 'records.sort(key=itemgetter(0))'
+    replacement = 'records.sort(key=itemgetter(0), reverse=True)  # Mutant: Reversed sort order'
     create_mutant("reverse_sort", original, replacement)
 except Exception as e:
     print(f"Error creating reverse_sort mutant: {e}")
@@ -3,9 +3,12 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 # Import the implemented modules
 import parser as parser_mod
@@ -13,6 +16,21 @@ import rules as rules_mod
 import report as report_mod
 import storage as storage_mod
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib json module
+    orjson = None
+
+
+def write_json(path: str, data: Dict[str, Any]) -> None:
+    """Write `data` to `path` as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
 
 def print_summary(violation_counts: Dict[str, int]) -> None:
     """Print a formatted summary of violation counts."""
@@ -27,6 +45,141 @@ def print_summary(violation_counts: Dict[str, int]) -> None:
         print(f"{vtype:<{max_type_len}}: {count}")
 
 
+def analyze(scenario_path: Path, logfile_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load a scenario and its log, detect violations, and build the report.
+
+    Touches no shared state, so batch mode can run it in worker processes.
+
+    Returns:
+        (scenario, report) as produced by parser.load_scenario and report.make_report
+    """
+    scenario = parser_mod.load_scenario(scenario_path)
+    # read_log is a generator; detect_violations consumes it in a single pass
+    events = parser_mod.read_log(logfile_path)
+    violations = rules_mod.detect_violations(scenario, events)
+    return scenario, report_mod.make_report(scenario, violations)
+
+
+def print_report(report: Dict[str, Any], output_file: str) -> None:
+    """Print the per-run console summary for a report saved to `output_file`."""
+    print(f"\nAnalysis complete. Report saved to {output_file}")
+    print(f"Scenario: {report['scenario']}")
+    print(f"Total violations: {report['total_violations']}")
+    
+    # Count violations by type for the summary
+    violation_counts = Counter(v['type'] for v in report['violations'])
+    
+    print_summary(violation_counts)
+
+
+def save_run(scenario: Dict[str, Any], scenario_path: Path, report: Dict[str, Any]) -> int:
+    """
+    Persist one analyzed run to the initialized database and return its scenario_id.
+    """
+    # The run can be re-analyzed on failure, so skip fsyncs while writing it
+    with storage_mod.bulk_load():
+        # Upsert ruleset and get rule_id
+        rule_id = storage_mod.upsert_ruleset(scenario['road_rules'])
+        
+        # Register scenario and get scenario_id
+        scenario_id = storage_mod.register_scenario(
+            name=scenario.get('name', 'Unnamed'),
+            source_file=str(scenario_path),
+            rule_id=rule_id,
+            description=scenario.get('description', ''),
+            speed_zones=scenario.get('speed_zones', [])
+        )
+        
+        # Save violations to database
+        storage_mod.save_report(scenario_id, report['violations'])
+    return scenario_id
+
+
+def read_batch(batch_path: Path) -> List[Tuple[Path, Path]]:
+    """
+    Read a batch file of `SCENARIO.json LOGFILE.txt` pairs, one per line.
+
+    Empty lines and lines starting with '#' are skipped.
+
+    Raises:
+        FileNotFoundError: If the batch file doesn't exist
+        ValueError: For lines that are not exactly two paths
+    """
+    jobs = []
+    with open(batch_path, 'r') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            if len(parts) != 2:
+                raise ValueError(f"Batch file line {line_num}: expected SCENARIO LOGFILE")
+            jobs.append((Path(parts[0]), Path(parts[1])))
+    return jobs
+
+
+def run_batch(batch_path: Path, db_path: str | None) -> int:
+    """
+    Analyze every run listed in `batch_path` in parallel worker processes.
+
+    Parsing and rule checks run in a ProcessPoolExecutor, one job per run.
+    Reports are written as report_<N>.json (N = position in the batch) and,
+    if `db_path` is given, saved from this process one after another so the
+    workers never contend for the SQLite write lock. A run that fails to
+    analyze or save is reported and skipped; the others still go through.
+
+    Returns:
+        0 if every run succeeded, 1 if any run failed, 2 for a bad batch file
+    """
+    try:
+        jobs = read_batch(batch_path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    status = 0
+    try:
+        # Workers are spawned, not forked: SQLite connections must not be
+        # carried across fork(), and the pool may start workers at any time
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(mp_context=context) as pool:
+            futures = [pool.submit(analyze, scn, log) for scn, log in jobs]
+            
+            if db_path:
+                storage_mod.init_db(db_path)
+            
+            for n, ((scenario_path, logfile_path), future) in enumerate(zip(jobs, futures), 1):
+                try:
+                    scenario, report = future.result()
+                except Exception as e:
+                    print(f"Error during analysis of {logfile_path}: {e}", file=sys.stderr)
+                    status = 1
+                    continue
+                
+                output_file = f"report_{n}.json"
+                write_json(output_file, report)
+                print_report(report, output_file)
+                
+                if db_path:
+                    try:
+                        scenario_id = save_run(scenario, scenario_path, report)
+                    except Exception as e:
+                        print(f"Error saving {logfile_path} to database: {e}", file=sys.stderr)
+                        status = 1
+                        continue
+                    print(f"\nResults saved to database (scenario_id: {scenario_id})")
+                    
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if db_path:
+            storage_mod.close_db()
+    
+    return status
+
+
 def main(argv: list[str] | None = None) -> int:
     """
     Incident Log Analyzer
@@ -35,6 +188,7 @@ def main(argv: list[str] | None = None) -> int:
       1) Summary mode:       --summary N --db DB.sqlite
       2) By-type query:      --by-type SCENARIO_ID TYPE --db DB.sqlite
       3) Analyze a run:      SCENARIO.json LOGFILE.txt [--db DB.sqlite]
+      4) Analyze a batch:    --batch RUNS.txt [--db DB.sqlite]
     """
     argv = argv if argv is not None else sys.argv[1:]
 
@@ -46,6 +200,8 @@ def main(argv: list[str] | None = None) -> int:
                    help="Print violation counts for the N most recent runs")
     ap.add_argument("--by-type", nargs=2, metavar=("SCENARIO_ID", "TYPE"),
                    help="List violations of a given TYPE for a scenario ID")
+    ap.add_argument("--batch", metavar="FILE",
+                   help="Analyze every 'SCENARIO.json LOGFILE.txt' pair listed in FILE in parallel")
     
     args = ap.parse_args(argv)
 
@@ -57,23 +213,22 @@ def main(argv: list[str] | None = None) -> int:
 
         try:
             storage_mod.init_db(args.db)
-            recent_violations = storage_mod.get_recent_violations(args.summary)
+            summary_counts = storage_mod.get_summary_counts(args.summary)
             
-            if not recent_violations:
+            if not summary_counts:
                 print("No recent violations found.")
                 return 0
                 
-            # Group violations by scenario
+            # Counts arrive already grouped by SQL; just bucket them per scenario
             scenarios: Dict[int, Dict[str, Any]] = {}
-            for v in recent_violations:
-                sid = v['scenario_id']
+            for row in summary_counts:
+                sid = row['scenario_id']
                 if sid not in scenarios:
                     scenarios[sid] = {
-                        'name': v['scenario_name'],
+                        'name': row['scenario_name'],
                         'violations': {}
                     }
-                scenarios[sid]['violations'][v['type']] = \
-                    scenarios[sid]['violations'].get(v['type'], 0) + 1
+                scenarios[sid]['violations'][row['type']] = row['count']
             
             # Print summary
             for sid, data in scenarios.items():
@@ -121,6 +276,10 @@ def main(argv: list[str] | None = None) -> int:
             
         return 0
 
+    # ----- Batch mode --------------------------------------------------------
+    if args.batch is not None:
+        return run_batch(Path(args.batch), args.db)
+
     # ----- Analyze a scenario + log ------------------------------------------
     if not args.scenario or not args.logfile:
         ap.print_help()
@@ -138,51 +297,18 @@ def main(argv: list[str] | None = None) -> int:
         return 2
 
     try:
-        # 1. Load scenario and parse log
-        scenario = parser_mod.load_scenario(scenario_path)
-        events = list(parser_mod.read_log(logfile_path))
+        # 1-3. Load scenario, parse log, detect violations, generate report
+        scenario, report = analyze(scenario_path, logfile_path)
         
-        # 2. Detect violations
-        violations = rules_mod.detect_violations(scenario, events)
-        
-        # 3. Generate report
-        report = report_mod.make_report(scenario, violations)
-        
-        # 4. Save report to JSON
+        # 4-5. Save report to JSON and print summary to console
         output_file = 'report.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
-        
-        # 5. Print summary to console
-        print(f"\nAnalysis complete. Report saved to {output_file}")
-        print(f"Scenario: {report['scenario']}")
-        print(f"Total violations: {report['total_violations']}")
-        
-        # Count violations by type for the summary
-        violation_counts: Dict[str, int] = {}
-        for v in report['violations']:
-            violation_counts[v['type']] = violation_counts.get(v['type'], 0) + 1
-        
-        print_summary(violation_counts)
+        write_json(output_file, report)
+        print_report(report, output_file)
         
         # 6. Save to database if requested
         if args.db:
             storage_mod.init_db(args.db)
-            
-            # Upsert ruleset and get rule_id
-            rule_id = storage_mod.upsert_ruleset(scenario['road_rules'])
-            
-            # Register scenario and get scenario_id
-            scenario_id = storage_mod.register_scenario(
-                name=scenario.get('name', 'Unnamed'),
-                source_file=str(scenario_path),
-                rule_id=rule_id,
-                description=scenario.get('description', ''),
-                speed_zones=scenario.get('speed_zones', [])
-            )
-            
-            # Save violations to database
-            storage_mod.save_report(scenario_id, report['violations'])
+            scenario_id = save_run(scenario, scenario_path, report)
             print(f"\nResults saved to database (scenario_id: {scenario_id})")
         
     except Exception as e:
@@ -191,6 +317,5 @@ def main(argv: list[str] | None = None) -> int:
     
     return 0
 
-
 if __name__ == "__main__":
     sys.exit(main())
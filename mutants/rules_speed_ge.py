@@ -1,17 +1,124 @@
 from __future__ import annotations
-from typing import Dict, Any, Iterable, List, Tuple
+import sys
+from operator import itemgetter
+from typing import Dict, Any, Iterable, List, Tuple, Union
 
-Event = Tuple[float, str, str]
+# arg is a float for SPEED / FOLLOW_DISTANCE when produced by parser.read_log;
+# numeric strings are accepted too
+Event = Tuple[float, str, Union[float, str]]
+
+# Zero-padded minute / second fields for _fmt_time
+_MM = [f"{i:02d}" for i in range(100)]
+_SS = [f"{i:02d}" for i in range(60)]
+
+# (time_sec, violation code, measured value, limit) as produced by _scan
+Record = Tuple[float, int, float, float]
+
+# Violation codes, indexing the two tables below
+_SPEEDING, _ROLLING_STOP, _TAILGATING, _UNSAFE_LANE_CHANGE = range(4)
+
+# Interned so the type strings shared by reports, Counters and the DB layer are single objects
+_VIOLATION_TYPES = tuple(map(sys.intern, ('SPEEDING', 'ROLLING_STOP', 'TAILGATING', 'UNSAFE_LANE_CHANGE')))
+
+_VIOLATION_DETAILS = (
+    "{0:.1f} mph in {1:.0f} mph zone",
+    "Stopped {0:.1f}s; required {1:.1f}s",
+    "{0:.1f} m < {1:.1f} m",
+    "follow {0:.1f} m < {1:.1f} m",
+)
 
 
 def _fmt_time(t: float) -> str:
     """
     Format seconds as MM:SS.s (zero-padded minutes, 1 decimal for seconds).
     Example: 62.5 -> "01:02.5"
+
+    Rounds to whole deciseconds first and splits with integer divmod, so a
+    value like 59.96 carries into the next minute ("01:00.0", not "00:60.0").
+    """
+    m, r = divmod(int(t * 10 + 0.5), 600)
+    s, d = divmod(r, 10)
+    return f"{_MM[m] if m < 100 else m}:{_SS[s]}.{d}"
+
+
+def _scan(
+    events: Iterable[Event],
+    speed_limit: float,
+    min_follow: float,
+    stop_wait: float
+) -> List[Record]:
     """
-    m = int(t // 60)
-    s = t - m * 60
-    return f"{m:02d}:{s:04.1f}"
+    Internal: run the rule state machine over the events.
+
+    `speed_limit` is the effective limit for the whole run (global max_speed
+    already combined with any speed zones).
+
+    All state is kept in plain float locals and each violation is emitted as a
+    numeric (time_sec, code, value, limit) record; detect_violations turns the
+    records into dicts afterwards.
+    """
+    # The road rules are fixed for the run, so fold the floating point
+    # epsilons into the thresholds once instead of re-adding them per event
+    speeding_above = speed_limit + 1e-9
+    too_close_below = min_follow - 1e-9
+    rolling_below = stop_wait - 1e-9
+    
+    records: List[Record] = []
+    emit = records.append
+    last_follow_dist = float('inf')
+    stop_sign_time = None
+    stopped = False
+    
+    # Process each event
+    for time_sec, kind, arg in events:
+        if kind == 'SPEED':
+            try:
+                speed = float(arg)  # no-op for the floats read_log yields
+            except (ValueError, TypeError):
+                # Skip invalid speed values
+                continue
+            
+            # Check for speeding violation
+            if speed >= speed_limit:  # Mutant: Changed > to >=
+                emit((time_sec, _SPEEDING, speed, speed_limit))
+            
+            # Rolling stop state machine: armed by a stop sign, marked stopped
+            # at the first speed <= 1.0 mph, resolved when the car moves again
+            if stop_sign_time is not None:
+                if speed > 1.0 + 1e-9:
+                    if stopped:
+                        time_since_stop = time_sec - stop_sign_time
+                        if time_since_stop < rolling_below:
+                            emit((time_sec, _ROLLING_STOP, time_since_stop, stop_wait))
+                    stop_sign_time = None  # Reset after checking
+                else:
+                    stopped = True
+                
+        elif kind == 'FOLLOW_DISTANCE':
+            try:
+                dist = float(arg)  # no-op for the floats read_log yields
+            except (ValueError, TypeError):
+                # Skip invalid distance values
+                continue
+            last_follow_dist = dist
+            
+            # Check for tailgating violation
+            if dist < too_close_below:
+                emit((time_sec, _TAILGATING, dist, min_follow))
+                
+        elif kind == 'LANE_CHANGE':
+            # Check for unsafe lane change violation
+            if last_follow_dist < too_close_below:
+                emit((time_sec, _UNSAFE_LANE_CHANGE, last_follow_dist, min_follow))
+                
+        elif kind == 'STOP_SIGN_DETECTED':
+            # Record the time when we see a stop sign
+            # We'll check for rolling stop when speed increases above 1.0 mph,
+            # provided the car came to a stop first
+            stop_sign_time = time_sec
+            stopped = False
+    
+    return records
 
 
 def detect_violations(scenario: Dict[str, Any], events: Iterable[Event]) -> List[Dict[str, str]]:
@@ -23,9 +130,9 @@ def detect_violations(scenario: Dict[str, Any], events: Iterable[Event]) -> List
       - min_follow_distance (meters, float-like)
       - stop_sign_wait (seconds, float-like)
 
-    Event kinds (time: float seconds, kind: str, arg: str):
-      - ("...", "SPEED", "<float mph>")
-      - ("...", "FOLLOW_DISTANCE", "<float meters>")
+    Event kinds (time: float seconds, kind: str, arg: float | str):
+      - ("...", "SPEED", <float mph>)
+      - ("...", "FOLLOW_DISTANCE", <float meters>)
       - ("...", "LANE_CHANGE", "LEFT" | "RIGHT")
       - ("...", "STOP_SIGN_DETECTED", "")
 
@@ -35,8 +142,9 @@ def detect_violations(scenario: Dict[str, Any], events: Iterable[Event]) -> List
     Required checks (use small epsilon like 1e-9 to avoid FP jitter):
       - SPEEDING when speed > max_speed
         details e.g.: f"{speed:.1f} mph in {max_speed:.0f} mph zone"
-      - ROLLING_STOP after STOP_SIGN_DETECTED if the vehicle accelerates past ~1.0 mph
-        before waiting stop_sign_wait seconds
+      - ROLLING_STOP after STOP_SIGN_DETECTED if the vehicle stops (<= ~1.0 mph) and
+        then accelerates past ~1.0 mph before waiting stop_sign_wait seconds;
+        a stop sign the vehicle never slows down for is ignored
         details e.g.: f"Stopped {waited:.1f}s; required {stop_wait:.1f}s"
       - TAILGATING when follow distance < min_follow
         details e.g.: f"{dist:.1f} m < {min_follow:.1f} m"
@@ -44,7 +152,8 @@ def detect_violations(scenario: Dict[str, Any], events: Iterable[Event]) -> List
         details e.g.: f"follow {dist:.1f} m < {min_follow:.1f} m"
 
     Ordering:
-      - Sort the final list by the human-formatted "time" string.
+      - Sorted by event time in seconds (numerically, so runs past 99 minutes
+        still order correctly), then formatted.
 
     Returns:
         List of violation dictionaries, each with keys:
@@ -66,86 +175,25 @@ def detect_violations(scenario: Dict[str, Any], events: Iterable[Event]) -> List
     except (TypeError, ValueError) as e:
         raise ValueError(f"Invalid road rule value: {e}")
 
-    # State tracking
-    violations = []
-    last_speed = 0.0
-    last_follow_dist = float('inf')
-    stop_sign_time = None
-    
-    # Check for speed zones if they exist
-    speed_zones = scenario.get('speed_zones', [])
-    
-    # Process each event
-    for time_sec, kind, arg in events:
-        time_str = _fmt_time(time_sec)
-        
-        if kind == 'SPEED':
-            try:
-                speed = float(arg)
-                last_speed = speed
-                
-                # Check for speeding violation
-                current_max_speed = max_speed
-                
-                # Check if we're in a speed zone
-                for zone in speed_zones:
-                    if 'start_mile' in zone and 'end_mile' in zone and 'speed_limit' in zone:
-                        # For simplicity, we're not tracking mileage, so we'll use the global max speed
-                        # In a real implementation, you'd track the vehicle's position
-                        current_max_speed = min(current_max_speed, float(zone['speed_limit']))
-                
-                if speed >= current_max_speed:  # Mutant: Changed > to >=
-                    violations.append({
-                        'type': 'SPEEDING',
-                        'time': time_str,
-                        'details': f"{speed:.1f} mph in {current_max_speed:.0f} mph zone"
-                    })
-                
-                # Check for rolling stop violation
-                if stop_sign_time is not None and speed > 1.0 + 1e-9:
-                    time_since_stop = time_sec - stop_sign_time
-                    if time_since_stop < stop_wait - 1e-9:  # Add small epsilon for floating point comparison
-                        violations.append({
-                            'type': 'ROLLING_STOP',
-                            'time': time_str,
-                            'details': f"Stopped {time_since_stop:.1f}s; required {stop_wait:.1f}s"
-                        })
-                    stop_sign_time = None  # Reset after checking
-            except (ValueError, TypeError):
-                # Skip invalid speed values
-                continue
-                
-        elif kind == 'FOLLOW_DISTANCE':
-            try:
-                dist = float(arg)
-                last_follow_dist = dist
-                
-                # Check for tailgating violation
-                if dist < min_follow - 1e-9:  # Add small epsilon for floating point comparison
-                    violations.append({
-                        'type': 'TAILGATING',
-                        'time': time_str,
-                        'details': f"{dist:.1f} m < {min_follow:.1f} m"
-                    })
-            except (ValueError, TypeError):
-                # Skip invalid distance values
-                continue
-                
-        elif kind == 'LANE_CHANGE':
-            # Check for unsafe lane change violation
-            if last_follow_dist < min_follow - 1e-9:  # Add small epsilon for floating point comparison
-                violations.append({
-                    'type': 'UNSAFE_LANE_CHANGE',
-                    'time': time_str,
-                    'details': f"follow {last_follow_dist:.1f} m < {min_follow:.1f} m"
-                })
-                
-        elif kind == 'STOP_SIGN_DETECTED':
-            # Record the time when we see a stop sign
-            # We'll check for rolling stop when speed increases above 1.0 mph
-            stop_sign_time = time_sec
+    # Fold speed zones into one limit up front; it is invariant over the run.
+    # For simplicity, we're not tracking mileage, so the strictest zone applies
+    # In a real implementation, you'd track the vehicle's position
+    current_max_speed = max_speed
+    for zone in scenario.get('speed_zones', []):
+        if 'start_mile' in zone and 'end_mile' in zone and 'speed_limit' in zone:
+            current_max_speed = min(current_max_speed, float(zone['speed_limit']))
+
+    records = _scan(events, current_max_speed, min_follow, stop_wait)
     
-    # Sort violations by time (as strings)
-    violations.sort(key=lambda v: v['time'])
+    # Sort by numeric time; the stable sort keeps same-time violations in emit order
+    records.sort(key=itemgetter(0))
     
-    return violations
+    # Build strings only for the violations found, after sorting
+    return [
+        {
+            'type': _VIOLATION_TYPES[code],
+            'time': _fmt_time(time_sec),
+            'details': _VIOLATION_DETAILS[code].format(value, limit)
+        }
+        for time_sec, code, value, limit in records
+    ]
\ No newline at end of file
@@ -1,8 +1,41 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterator, Dict, Any, Tuple
+from typing import IO, Iterator, Dict, Any, Tuple
 import json
+import mmap
+import os
+import re
+import sys
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib json module
+    orjson = None
+
+# One log line: MM:SS[.s] EVENT_TYPE [ARGUMENT]
+_LINE_RE = re.compile(r'^\s*(\d+):(\d+(?:\.\d+)?)\s+([A-Z_]+)(?:\s+(\S+))?\s*$')
+
+# The same line grammar over a whole bytes buffer, for read_log's bulk scan
+_LINE_RE_BYTES = re.compile(rb'(?m)^[ \t]*(\d+):(\d+(?:\.\d+)?)[ \t]+([A-Z_]+)(?:[ \t]+(\S+))?[ \t\r]*(?:\n|\Z)')
+
+# A carriage return not followed by a line feed: an old Mac style line
+# ending, which the bulk scan and slow path only see after normalization
+_BARE_CR_RE = re.compile(rb'\r(?!\n)')
+
+_VALID_EVENTS = frozenset(map(sys.intern, ('SPEED', 'FOLLOW_DISTANCE', 'LANE_CHANGE', 'STOP_SIGN_DETECTED')))
+
+# Raw event-type bytes -> the interned str, so every yielded event_type is the
+# same object and downstream == checks / dict hashing hit the identity fast path
+_EVENT_NAMES = {name.encode('ascii'): name for name in _VALID_EVENTS}
+
+# A standalone timestamp for parse_time: M:SS with at most one decimal digit
+_TIME_RE = re.compile(r'(\d+):(\d+)(?:\.(\d))?')
+
+_DIRECTIONS = {b'LEFT': 'LEFT', b'RIGHT': 'RIGHT'}
+
+# Log files larger than this are memory-mapped instead of read in one go
+_MMAP_THRESHOLD = 64 * 1024 * 1024
 
 
 def load_scenario(path: Path) -> Dict[str, Any]:
@@ -25,10 +58,15 @@ def load_scenario(path: Path) -> Dict[str, Any]:
         json.JSONDecodeError: If the file contains invalid JSON.
         ValueError: If required fields are missing or have incorrect types.
     """
-    # Load the JSON file
+    # Load the JSON file: one read() of the raw bytes, no text decoding layer
+    # (orjson parses the bytes directly when available)
     try:
-        with open(path, 'r') as f:
-            data = json.load(f)
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            raw = _read_all(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except FileNotFoundError:
         raise FileNotFoundError(f"Scenario file not found: {path}")
     except json.JSONDecodeError as e:
@@ -55,6 +93,9 @@ def parse_time(ts: str) -> float:
     """
     Convert a timestamp like 'M:SS' or 'M:SS.s' into seconds (float).
 
+    Surrounding whitespace is ignored. At most one decimal digit is accepted;
+    log lines are more lenient, see read_log.
+
     Examples:
       '0:05'   -> 5.0
       '1:02.5' -> 62.5
@@ -68,34 +109,145 @@ def parse_time(ts: str) -> float:
     Raises:
         ValueError: If the timestamp format is invalid
     """
+    # Cheap substring check before running the regex at all
+    if ':' not in ts:
+        raise ValueError(f"Invalid time format: {ts}")
+    
+    m = _TIME_RE.fullmatch(ts.strip())
+    if m is None:
+        raise ValueError(f"Invalid time format: {ts}")
+    
+    minutes_s, seconds_s, tenths_s = m.groups()
+    seconds = int(seconds_s)
+    
+    # Validate ranges
+    if seconds >= 60:
+        raise ValueError(f"Invalid time format: {ts}")
+    
+    # Integer math in tenths, divided once: exact for every M:SS.s input
+    tenths = int(minutes_s) * 600 + seconds * 10
+    if tenths_s is not None:
+        tenths += int(tenths_s)
+    return tenths / 10
+
+
+def _read_all(fd: int, size: int) -> bytes:
+    """
+    Internal: read `size` bytes from `fd`, normally in a single read() syscall.
+
+    Bypasses the buffered-IO layer; only loops if the OS returns a short read.
+    """
+    data = os.read(fd, size)
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _read_buffer(path: Path) -> bytes | mmap.mmap:
+    """
+    Internal: return the raw contents of a log file as one bytes-like buffer.
+
+    Files up to _MMAP_THRESHOLD bytes are read with a single read(); larger
+    files are memory-mapped so the OS pages them in as the scan advances.
+    """
+    fd = os.open(path, os.O_RDONLY)
     try:
-        # Split into minutes and seconds parts
-        parts = ts.split(':')
-        if len(parts) != 2:
-            raise ValueError(f"Invalid time format: {ts}")
-            
-        minutes = int(parts[0])
-        seconds = float(parts[1])
+        size = os.fstat(fd).st_size
+        if size <= _MMAP_THRESHOLD:
+            return _read_all(fd, size)
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _parse_line(path: Path, line: str, line_num: int) -> Tuple[float, str, float | str] | None:
+    """
+    Internal: parse one decoded log line, or return None for blank/comment lines.
+
+    This is the slow path read_log falls back to whenever the bulk scan meets a
+    line it can't accept as-is; it produces the line-numbered error messages.
+
+    Raises:
+        ValueError: For a malformed line
+    """
+    # Skip empty lines and comments
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    
+    try:
+        m = _LINE_RE.match(line)
+        if m is None:
+            raise ValueError(f"Line {line_num}: Invalid format")
         
-        # Validate ranges
-        if minutes < 0 or seconds < 0 or seconds >= 60:
-            raise ValueError(f"Time values out of range: {ts}")
-            
-        return minutes * 60 + seconds
+        # Parse timestamp and event type
+        minutes_str, seconds_str, event_type, event_arg = m.groups()
+        seconds = float(seconds_str)
+        if seconds >= 60:
+            raise ValueError(f"Line {line_num}: Time values out of range: {minutes_str}:{seconds_str}")
+        timestamp = int(minutes_str) * 60 + seconds
         
-    except (ValueError, IndexError) as e:
-        raise ValueError(f"Invalid time format: {ts}") from e
+        # Validate event type
+        if event_type not in _VALID_EVENTS:
+            raise ValueError(f"Line {line_num}: Unknown event type: {event_type}")
+        
+        # Handle event arguments
+        if event_type in ('SPEED', 'FOLLOW_DISTANCE'):
+            if event_arg is None:
+                raise ValueError(f"Line {line_num}: {event_type} requires a numeric argument")
+            try:
+                event_arg = float(event_arg)
+            except ValueError:
+                raise ValueError(f"Line {line_num}: Invalid numeric value: {event_arg}")
+        elif event_type == 'LANE_CHANGE':
+            if event_arg not in ('LEFT', 'RIGHT'):
+                raise ValueError(f"Line {line_num}: LANE_CHANGE requires 'LEFT' or 'RIGHT'")
+        elif event_arg is not None:
+            raise ValueError(f"Line {line_num}: STOP_SIGN_DETECTED takes no arguments")
+        else:
+            event_arg = ''
+        
+        return (timestamp, sys.intern(event_type), event_arg)
+        
+    except ValueError as e:
+        raise ValueError(f"Error in log file '{path}', line {line_num}: {str(e)}")
+
+
+def _parse_gap(path: Path, gap: bytes, line_num: int) -> Iterator[Tuple[float, str, float | str]]:
+    """
+    Internal: run the slow path over `gap`, text the bulk scan did not accept.
+
+    `line_num` is the line the gap starts on. Usually the gap holds only blank
+    lines or comments and nothing is yielded; anything else goes through
+    _parse_line, which raises with the right line number.
+    """
+    for raw in gap.split(b'\n'):
+        event = _parse_line(path, raw.decode('utf-8'), line_num)
+        if event is not None:
+            yield event
+        line_num += 1
 
 
-def read_log(path: Path) -> Iterator[Tuple[float, str, str]]:
+def read_log(path: Path | IO) -> Iterator[Tuple[float, str, float | str]]:
     """
     Read a log file and yield (time_sec, event_type, event_arg) tuples.
 
+    `path` may also be an open file-like object (text or binary), e.g. an
+    io.StringIO; it is read to the end and parsed the same way. Its `name`
+    attribute, if any, is used in error messages.
+
     Each line in the log file has the format:
       TIMESTAMP EVENT_TYPE [ARGUMENT]
+    Lines may end in \n, \r\n or a bare \r.
 
     Where:
-      - TIMESTAMP is in MM:SS.s format (see parse_time).
+      - TIMESTAMP is MINUTES:SECONDS, each one or more digits, where SECONDS
+        may have a fraction of any length (e.g. 0:05, 1:02.5, 0:01.55) and
+        must be below 60. This is looser than parse_time, which allows at
+        most one decimal digit.
       - EVENT_TYPE is one of: SPEED, FOLLOW_DISTANCE, LANE_CHANGE, STOP_SIGN_DETECTED.
       - ARGUMENT is optional and depends on the event type:
           * SPEED <float>           # speed in mph
@@ -103,61 +255,83 @@ def read_log(path: Path) -> Iterator[Tuple[float, str, str]]:
           * LANE_CHANGE <direction>  # 'LEFT' or 'RIGHT'
           * STOP_SIGN_DETECTED       # no argument
 
+    The whole file is scanned with one multiline bytes regex (_LINE_RE_BYTES)
+    via finditer, so no per-line str objects are created for well-formed input.
+    Text the scan skips over, and matches that fail validation, are handed to
+    the line-by-line slow path (_parse_line) for line-numbered errors.
+
     Yields:
-      (time_sec: float, event_type: str, event_arg: str)
+      (time_sec: float, event_type: str, event_arg: float | str)
       - time_sec: parsed timestamp in seconds (float)
       - event_type: one of the EVENT_TYPE strings
-      - event_arg: the rest of the line after EVENT_TYPE
+      - event_arg: the parsed float for SPEED / FOLLOW_DISTANCE (so callers
+        don't convert it again), the direction for LANE_CHANGE, '' otherwise
       
     Raises:
         FileNotFoundError: If the log file doesn't exist
         ValueError: For malformed log lines
     """
-    valid_events = {'SPEED', 'FOLLOW_DISTANCE', 'LANE_CHANGE', 'STOP_SIGN_DETECTED'}
+    if hasattr(path, 'read'):
+        data = path.read()
+        buf = data.encode('utf-8') if isinstance(data, str) else data
+        path = getattr(path, 'name', '<stream>')
+    else:
+        try:
+            buf = _read_buffer(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Log file not found: {path}")
     
-    try:
-        with open(path, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                # Skip empty lines and comments
-                line = line.strip()
-                if not line or line.startswith('#'):
+    # Text-mode open() used to accept any line ending; \r\n is handled by the
+    # scan itself, so only logs with bare \r endings pay for a copy
+    if _BARE_CR_RE.search(buf):
+        buf = bytes(buf).replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    
+    # Line numbers are only needed on the slow path, so newlines are counted
+    # lazily from the last position they were counted up to
+    counted_pos = 0
+    counted_lines = 1
+    
+    def line_at(offset: int) -> int:
+        nonlocal counted_pos, counted_lines
+        counted_lines += buf[counted_pos:offset].count(b'\n')
+        counted_pos = offset
+        return counted_lines
+    
+    pos = 0
+    for m in _LINE_RE_BYTES.finditer(buf):
+        start = m.start()
+        if start != pos:
+            gap = buf[pos:start]
+            if gap.strip():
+                yield from _parse_gap(path, gap, line_at(pos))
+        pos = m.end()
+        
+        minutes, seconds, event_type, event_arg = m.groups()
+        seconds = float(seconds)
+        event_type = _EVENT_NAMES.get(event_type)
+        
+        if seconds < 60 and event_type is not None:
+            if event_type in ('SPEED', 'FOLLOW_DISTANCE'):
+                if event_arg is not None:
+                    try:
+                        value = float(event_arg)
+                    except ValueError:
+                        pass
+                    else:
+                        yield (int(minutes) * 60 + seconds, event_type, value)
+                        continue
+            elif event_type == 'LANE_CHANGE':
+                direction = _DIRECTIONS.get(event_arg)
+                if direction is not None:
+                    yield (int(minutes) * 60 + seconds, event_type, direction)
                     continue
-                
-                try:
-                    # Split into parts
-                    parts = line.split()
-                    if len(parts) < 2:
-                        raise ValueError(f"Line {line_num}: Invalid format")
-                    
-                    # Parse timestamp and event type
-                    timestamp = parse_time(parts[0])
-                    event_type = parts[1]
-                    
-                    # Validate event type
-                    if event_type not in valid_events:
-                        raise ValueError(f"Line {line_num}: Unknown event type: {event_type}")
-                    
-                    # Handle event arguments
-                    event_arg = ''
-                    if event_type in ('SPEED', 'FOLLOW_DISTANCE'):
-                        if len(parts) != 3:
-                            raise ValueError(f"Line {line_num}: {event_type} requires a numeric argument")
-                        try:
-                            float(parts[2])  # Validate it's a number
-                        except ValueError:
-                            raise ValueError(f"Line {line_num}: Invalid numeric value: {parts[2]}")
-                        event_arg = parts[2]
-                    elif event_type == 'LANE_CHANGE':
-                        if len(parts) != 3 or parts[2] not in ('LEFT', 'RIGHT'):
-                            raise ValueError(f"Line {line_num}: LANE_CHANGE requires 'LEFT' or 'RIGHT'")
-                        event_arg = parts[2]
-                    elif event_type == 'STOP_SIGN_DETECTED' and len(parts) != 2:
-                        raise ValueError(f"Line {line_num}: STOP_SIGN_DETECTED takes no arguments")
-                    
-                    yield (timestamp, event_type, event_arg)
-                    
-                except ValueError as e:
-                    raise ValueError(f"Error in log file '{path}', line {line_num}: {str(e)}")
-                    
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Log file not found: {path}")
+            elif event_arg is None:
+                yield (int(minutes) * 60 + seconds, event_type, '')
+                continue
+        
+        # Failed validation: let the slow path produce the error
+        yield from _parse_gap(path, buf[start:pos], line_at(start))
+    
+    gap = buf[pos:]
+    if gap.strip():
+        yield from _parse_gap(path, gap, line_at(pos))
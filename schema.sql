@@ -9,10 +9,17 @@ CREATE TABLE IF NOT EXISTS ruleset (
     max_speed REAL NOT NULL,
     min_follow_distance REAL NOT NULL,
     stop_sign_wait REAL NOT NULL,
+    -- The same values in integer units of 1e-9, for exact indexed lookups
+    max_speed_q INTEGER NOT NULL,
+    min_follow_distance_q INTEGER NOT NULL,
+    stop_sign_wait_q INTEGER NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(max_speed, min_follow_distance, stop_sign_wait)
 );
 
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ruleset_quantized
+    ON ruleset(max_speed_q, min_follow_distance_q, stop_sign_wait_q);
+
 -- Table to store scenarios
 CREATE TABLE IF NOT EXISTS scenario (
     scenario_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -46,7 +53,24 @@ CREATE TABLE IF NOT EXISTS violation (
     FOREIGN KEY (scenario_id) REFERENCES scenario(scenario_id) ON DELETE CASCADE
 );
 
+-- Running per-type violation totals, maintained by save_report
+CREATE TABLE IF NOT EXISTS violation_counts (
+    scenario_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    cnt INTEGER NOT NULL,
+    PRIMARY KEY (scenario_id, type),
+    FOREIGN KEY (scenario_id) REFERENCES scenario(scenario_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
 -- Indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_violation_scenario ON violation(scenario_id);
 CREATE INDEX IF NOT EXISTS idx_violation_type ON violation(type);
+-- (scenario_id, type, tstamp) serves the by-type lookup in index order, so it
+-- needs no sort step; it also covers the per-type counts and every
+-- scenario_id lookup, which makes the two shorter indexes redundant
+DROP INDEX IF EXISTS idx_violation_scenario;
+DROP INDEX IF EXISTS idx_violation_scenario_type;
+CREATE INDEX IF NOT EXISTS idx_violation_scenario_type_time ON violation(scenario_id, type, tstamp);
 CREATE INDEX IF NOT EXISTS idx_violation_time ON violation(tstamp);
+-- Newest-first scan for recent violations; violation_id is the rowid, so it
+-- is already the index's implicit tie-breaker
+CREATE INDEX IF NOT EXISTS idx_violation_recent ON violation(created_at);
@@ -1,21 +1,267 @@
 from __future__ import annotations
+import queue
+import threading
+from collections import Counter, OrderedDict
+from itertools import chain
+import math
+from operator import itemgetter
 import sqlite3
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
-_DB: Optional[sqlite3.Connection] = None
+# Number of read-only connections opened next to the single writer
+READER_COUNT = 4
+
+_WRITER: Optional[sqlite3.Connection] = None
+_READERS: Optional[queue.LifoQueue] = None
+
+# Database the connections above were opened on, for overflow readers
+_DB_PATH: Optional[Path] = None
+
+# Contents of schema.sql, read on the first init_db call and reused after
+_SCHEMA_SQL: Optional[str] = None
+
+# Rule values are also stored as integers in units of 1e-9, the tolerance
+# rulesets have always been matched with, so lookups are exact index probes
+_RULE_SCALE = 10 ** 9
+
+# Rows per batch in save_report, and rows per multi-row INSERT within a
+# batch (4 parameters each, well under SQLite's 32766 parameter limit)
+_INSERT_CHUNK = 5000
+_ROWS_PER_INSERT = 100
+
+# Reports at least this large, and at least as large as the rows already
+# stored, are loaded with the violation indexes dropped and rebuilt after
+_BULK_INDEX_THRESHOLD = 50_000
+
+# rule_id of every ruleset seen since init_db, keyed by its quantized values
+_RULESET_CACHE: Dict[Tuple[int, int, int], int] = {}
+
+# Bounded LRU caches of read results. Entries for a scenario are dropped when
+# save_report writes to it; writes made by other processes are not seen.
+_RESULT_CACHE_SIZE = 128
+_COUNTS_CACHE: OrderedDict = OrderedDict()   # scenario_id -> counts dict
+_BYTYPE_CACHE: OrderedDict = OrderedDict()   # (scenario_id, vtype) -> list
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# scenario_id -> number of times its cached results were invalidated. A read
+# notes the generation before querying and only caches its result if no
+# write to the scenario finished in between.
+_CACHE_GENERATION: Dict[int, int] = {}
 
 
 def _conn() -> sqlite3.Connection:
-    """Internal: return the initialized DB connection."""
-    assert _DB is not None, "DB not initialized"
-    return _DB
+    """Internal: return the initialized writer connection."""
+    assert _WRITER is not None, "DB not initialized"
+    return _WRITER
+
+
+@contextmanager
+def _reader_conn() -> Iterator[sqlite3.Connection]:
+    """
+    Internal: borrow a read-only connection from the pool.
+
+    Under WAL, readers do not block the writer or each other, so the get_*
+    queries can run from several threads at once. The pool is LIFO so the
+    most recently used connection, whose page cache is warmest, is reused
+    first.
+
+    If every pooled connection is checked out (for instance by open
+    get_violations_by_type_iter iterators), a temporary reader is opened for
+    the block and closed after, rather than waiting on a connection the same
+    thread may be holding.
+    """
+    assert _READERS is not None, "DB not initialized"
+    try:
+        conn = _READERS.get_nowait()
+    except queue.Empty:
+        conn = _open_reader(_DB_PATH)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    
+    try:
+        yield conn
+    finally:
+        _READERS.put(conn)
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Internal: run the block in one explicit write transaction.
+
+    Connections are opened in autocommit mode, so multi-statement writes
+    group themselves here. BEGIN IMMEDIATE takes the write lock up front
+    instead of upgrading a read lock at the first INSERT, which can stall
+    under WAL. Any exception rolls the whole block back.
+    """
+    conn.execute('BEGIN IMMEDIATE;')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK;')
+        raise
+    conn.execute('COMMIT;')
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Internal: open one connection with the shared per-connection settings."""
+    # isolation_level=None: no implicit BEGINs, see _transaction()
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Enable dictionary-style access to rows
+    
+    # Enable foreign key constraints
+    conn.execute('PRAGMA foreign_keys = ON;')
+    
+    # Larger page cache (64 MiB) and memory-mapped reads so the violation
+    # indexes stay resident for the summary / by-type queries
+    conn.execute('PRAGMA cache_size = -65536;')
+    conn.execute('PRAGMA mmap_size = 268435456;')
+    conn.execute('PRAGMA temp_store = MEMORY;')
+    return conn
+
+
+def _open_reader(db_path: Path) -> sqlite3.Connection:
+    """Internal: open one read-only connection for the pool or an overflow read."""
+    reader = _connect(db_path)
+    reader.execute('PRAGMA query_only = ON;')
+    # The get_* functions index rows by position, so readers return plain
+    # tuples rather than paying for sqlite3.Row's by-name lookup
+    reader.row_factory = None
+    return reader
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Internal: add the quantized ruleset columns to databases created before them."""
+    columns = {row['name'] for row in conn.execute('PRAGMA table_info(ruleset);')}
+    if not columns or 'max_speed_q' in columns:
+        return  # New database, or already migrated
+    
+    with _transaction(conn):
+        for column in ('max_speed', 'min_follow_distance', 'stop_sign_wait'):
+            conn.execute(f'ALTER TABLE ruleset ADD COLUMN {column}_q INTEGER;')
+            conn.execute(
+                f'UPDATE ruleset SET {column}_q = CAST(round({column} * ?) AS INTEGER);',
+                (_RULE_SCALE,)
+            )
+
+
+def _backfill_counts(conn: sqlite3.Connection) -> None:
+    """Internal: fill violation_counts for databases created before it existed."""
+    has_counts, has_violations = conn.execute(
+        """
+        SELECT EXISTS (SELECT 1 FROM violation_counts),
+               EXISTS (SELECT 1 FROM violation)
+        """
+    ).fetchone()
+    if has_counts or not has_violations:
+        return
+    
+    with _transaction(conn):
+        conn.execute(
+            """
+            INSERT INTO violation_counts (scenario_id, type, cnt)
+            SELECT scenario_id, type, COUNT(*)
+            FROM violation
+            GROUP BY scenario_id, type
+            """
+        )
+
+
+def _require_scenario(conn: sqlite3.Connection, scenario_id: int) -> None:
+    """Internal: raise ValueError if no scenario has the given ID."""
+    cursor = conn.execute(
+        "SELECT 1 FROM scenario WHERE scenario_id = ?",
+        (scenario_id,)
+    )
+    if not cursor.fetchone():
+        raise ValueError(f"Scenario with ID {scenario_id} does not exist")
+
+
+def _cache_get(cache: OrderedDict, key: Any) -> Any:
+    """Internal: return the cached value for `key` (or None) and mark it recent."""
+    with _RESULT_CACHE_LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_generation(scenario_id: int) -> int:
+    """Internal: return the scenario's cache generation, to pass to _cache_put."""
+    with _RESULT_CACHE_LOCK:
+        return _CACHE_GENERATION.get(scenario_id, 0)
+
+
+def _cache_put(
+    cache: OrderedDict, key: Any, value: Any, scenario_id: int, generation: int
+) -> None:
+    """
+    Internal: store `value`, evicting the least recently used entry if full.
+
+    Nothing is stored if the scenario was invalidated since `generation` was
+    read, since `value` may then predate that write.
+    """
+    with _RESULT_CACHE_LOCK:
+        if _CACHE_GENERATION.get(scenario_id, 0) != generation:
+            return
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _RESULT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _invalidate_scenario(scenario_id: int) -> None:
+    """Internal: drop every cached read result for one scenario."""
+    with _RESULT_CACHE_LOCK:
+        _CACHE_GENERATION[scenario_id] = _CACHE_GENERATION.get(scenario_id, 0) + 1
+        _COUNTS_CACHE.pop(scenario_id, None)
+        for key in [key for key in _BYTYPE_CACHE if key[0] == scenario_id]:
+            del _BYTYPE_CACHE[key]
+
+
+def _schema_sql() -> str:
+    """Internal: return the text of schema.sql, reading the file only once."""
+    global _SCHEMA_SQL
+    
+    if _SCHEMA_SQL is None:
+        schema_path = Path(__file__).parent / 'schema.sql'
+        if not schema_path.exists():
+            raise FileNotFoundError(f"Schema file not found: {schema_path}")
+        
+        _SCHEMA_SQL = schema_path.read_text(encoding='utf-8')
+    return _SCHEMA_SQL
+
+
+def close_db() -> None:
+    """Close the writer and every pooled reader connection, if open."""
+    global _WRITER, _READERS
+    
+    # Cached rule_ids and results belong to the database being closed
+    _RULESET_CACHE.clear()
+    with _RESULT_CACHE_LOCK:
+        _COUNTS_CACHE.clear()
+        _BYTYPE_CACHE.clear()
+    if _READERS is not None:
+        while not _READERS.empty():
+            _READERS.get_nowait().close()
+        _READERS = None
+    if _WRITER is not None:
+        _WRITER.close()
+        _WRITER = None
 
 
 def init_db(path: str) -> None:
     """
-    Open (or create) the SQLite DB at `path`, enable foreign keys, and apply schema.sql.
+    Open (or create) the SQLite DB at `path`, switch to WAL journaling, apply
+    schema.sql, and open the pool of read-only connections.
+
+    Any connections from a previous init_db call are closed first.
 
     Args:
         path: Path to the SQLite database file
@@ -24,29 +270,63 @@ def init_db(path: str) -> None:
         sqlite3.Error: If there's an error initializing the database
         FileNotFoundError: If schema.sql is not found
     """
-    global _DB
+    global _WRITER, _READERS, _DB_PATH
+    
+    close_db()
     
     # Create directory if it doesn't exist
     db_path = Path(path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
+    _DB_PATH = db_path
     
     # Connect to the database
-    _DB = sqlite3.connect(db_path)
-    _DB.row_factory = sqlite3.Row  # Enable dictionary-style access to rows
+    _WRITER = _connect(db_path)
     
-    # Enable foreign key constraints
-    _DB.execute('PRAGMA foreign_keys = ON;')
+    # WAL with synchronous=NORMAL only fsyncs at checkpoints, not on every
+    # commit, and still cannot corrupt the database on a crash
+    _WRITER.execute('PRAGMA journal_mode = WAL;')
+    _WRITER.execute('PRAGMA synchronous = NORMAL;')
+    _WRITER.execute('PRAGMA wal_autocheckpoint = 1000;')
     
     # Read and execute schema.sql
-    schema_path = Path(__file__).parent / 'schema.sql'
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema file not found: {schema_path}")
+    schema_sql = _schema_sql()
     
-    with open(schema_path, 'r') as f:
-        schema_sql = f.read()
+    _migrate(_WRITER)
+    _WRITER.executescript(schema_sql)
+    _backfill_counts(_WRITER)
+    
+    # Readers are opened after the schema exists and can never write
+    _READERS = queue.LifoQueue()
+    for _ in range(READER_COUNT):
+        _READERS.put(_open_reader(db_path))
+
+
+@contextmanager
+def bulk_load() -> Iterator[None]:
+    """
+    Relax durability while a batch of writes runs, then restore the old setting.
+
+    Inside the block SQLite does not fsync (`synchronous=OFF`). The database
+    is already in WAL mode, so the journal itself is left alone; switching it
+    would force a checkpoint on the way in and out. A crash mid-load can lose
+    the rows written in the block, so use it only for loads that can be
+    rerun, such as analyzing a log.
+
+    Example:
+        >>> with bulk_load():
+        ...     save_report(scenario_id, violations)
+        
+    Raises:
+        sqlite3.Error: If there's a database error
+    """
+    conn = _conn()
+    synchronous = conn.execute('PRAGMA synchronous;').fetchone()[0]
     
-    _DB.executescript(schema_sql)
-    _DB.commit()
+    conn.execute('PRAGMA synchronous = OFF;')
+    try:
+        yield
+    finally:
+        conn.execute(f'PRAGMA synchronous = {synchronous};')
 
 
 def upsert_ruleset(rules: Dict[str, Any]) -> int:
@@ -64,7 +344,8 @@ def upsert_ruleset(rules: Dict[str, Any]) -> int:
         int: The rule_id of the existing or newly created ruleset
         
     Raises:
-        ValueError: If required keys are missing from the rules dictionary
+        ValueError: If required keys are missing from the rules dictionary, or
+                    a value is not a finite number small enough to quantize
         sqlite3.Error: If there's a database error
     """
     required_keys = {'max_speed', 'min_follow_distance', 'stop_sign_wait'}
@@ -80,34 +361,42 @@ def upsert_ruleset(rules: Dict[str, Any]) -> int:
     except (TypeError, ValueError) as e:
         raise ValueError(f"Invalid rule value: {e}")
     
-    conn = _conn()
+    # The quantized copies are stored as SQLite INTEGERs (signed 64-bit)
+    for value in (max_speed, min_follow, stop_wait):
+        if not (math.isfinite(value) and abs(value) * _RULE_SCALE < 2 ** 63):
+            raise ValueError(f"Invalid rule value: {value}")
     
-    # Check if an identical ruleset exists
-    cursor = conn.execute(
-        """
-        SELECT rule_id FROM ruleset 
-        WHERE abs(max_speed - ?) < 1e-9 
-          AND abs(min_follow_distance - ?) < 1e-9 
-          AND abs(stop_sign_wait - ?) < 1e-9
-        """,
-        (max_speed, min_follow, stop_wait)
+    key = (
+        round(max_speed * _RULE_SCALE),
+        round(min_follow * _RULE_SCALE),
+        round(stop_wait * _RULE_SCALE),
     )
+    cached = _RULESET_CACHE.get(key)
+    if cached is not None:
+        return cached
     
-    existing = cursor.fetchone()
-    if existing:
-        return existing['rule_id']
+    conn = _conn()
     
-    # Insert new ruleset
+    # Insert the ruleset, or hit the unique index on the quantized columns
+    # and return the existing row; the no-op update is what makes RETURNING
+    # yield the existing rule_id
     cursor = conn.execute(
         """
-        INSERT INTO ruleset (max_speed, min_follow_distance, stop_sign_wait)
-        VALUES (?, ?, ?)
+        INSERT INTO ruleset (
+            max_speed, min_follow_distance, stop_sign_wait,
+            max_speed_q, min_follow_distance_q, stop_sign_wait_q
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (max_speed_q, min_follow_distance_q, stop_sign_wait_q)
+        DO UPDATE SET max_speed = max_speed
+        RETURNING rule_id
         """,
-        (max_speed, min_follow, stop_wait)
+        (max_speed, min_follow, stop_wait) + key
     )
-    conn.commit()
+    rule_id = cursor.fetchone()['rule_id']
     
-    return cursor.lastrowid
+    _RULESET_CACHE[key] = rule_id
+    return rule_id
 
 
 def register_scenario(
@@ -139,39 +428,31 @@ def register_scenario(
     if speed_zones is None:
         speed_zones = []
     
-    conn = _conn()
-    
-    try:
+    with _transaction(_conn()) as conn:
         # Insert the scenario
-        cursor = conn.execute(
+        scenario_id = conn.execute(
             """
             INSERT INTO scenario (name, description, source_file, rule_id)
             VALUES (?, ?, ?, ?)
+            RETURNING scenario_id
             """,
             (name, description, source_file, rule_id)
-        )
-        scenario_id = cursor.lastrowid
+        ).fetchone()[0]
         
         # Insert speed zones if any
         if speed_zones:
-            zone_data = [
-                (scenario_id, zone['start_mile'], zone['end_mile'], zone['speed_limit'])
-                for zone in speed_zones
-            ]
             conn.executemany(
                 """
                 INSERT INTO speed_zone (scenario_id, start_mile, end_mile, speed_limit)
                 VALUES (?, ?, ?, ?)
                 """,
-                zone_data
+                (
+                    (scenario_id, zone['start_mile'], zone['end_mile'], zone['speed_limit'])
+                    for zone in speed_zones
+                )
             )
-        
-        conn.commit()
-        return scenario_id
-        
-    except sqlite3.Error as e:
-        conn.rollback()
-        raise e
+    
+    return scenario_id
 
 
 def save_report(scenario_id: int, violations: List[Dict[str, Any]]) -> None:
@@ -192,44 +473,101 @@ def save_report(scenario_id: int, violations: List[Dict[str, Any]]) -> None:
     if not violations:
         return  # Nothing to save
     
-    # Validate input format
-    required_keys = {'type', 'time', 'details'}
-    for i, violation in enumerate(violations):
-        missing_keys = required_keys - violation.keys()
-        if missing_keys:
-            raise ValueError(f"Violation at index {i} missing keys: {', '.join(missing_keys)}")
-    
-    conn = _conn()
+    # Validate and build the rows in one pass; a KeyError means a key is
+    # missing, and only then is the list rescanned to say which
+    get_fields = itemgetter('time', 'type', 'details')
+    try:
+        violation_data = [(scenario_id, *get_fields(viol)) for viol in violations]
+    except KeyError:
+        required_keys = {'type', 'time', 'details'}
+        for i, violation in enumerate(violations):
+            missing_keys = required_keys - violation.keys()
+            if missing_keys:
+                raise ValueError(
+                    f"Violation at index {i} missing keys: {', '.join(missing_keys)}"
+                ) from None
+        raise
     
     try:
-        # Verify the scenario exists
-        cursor = conn.execute(
-            "SELECT 1 FROM scenario WHERE scenario_id = ?",
-            (scenario_id,)
+        _insert_violations(scenario_id, violation_data)
+    except sqlite3.IntegrityError as e:
+        # The foreign key on violation.scenario_id rejects unknown scenarios,
+        # so no separate existence check is needed on the common path
+        if 'FOREIGN KEY' in str(e):
+            raise ValueError(f"Scenario with ID {scenario_id} does not exist") from e
+        raise
+    finally:
+        # After the commit; the generation bump also stops reads that began
+        # before it from caching the pre-insert state
+        _invalidate_scenario(scenario_id)
+
+
+def _insert_violations(
+    scenario_id: int, violation_data: List[Tuple[int, str, str, str]]
+) -> None:
+    """Internal: insert (scenario_id, tstamp, type, details) rows in one transaction."""
+    with _transaction(_conn()) as conn:
+        # Building an index once over sorted keys beats updating it row by row,
+        # but only while the rebuild isn't dominated by rows already stored.
+        # It all happens inside the transaction, so readers never see the
+        # table without its indexes.
+        rebuild: List[Tuple[str, str]] = []
+        if len(violation_data) >= _BULK_INDEX_THRESHOLD:
+            stored = conn.execute(
+                "SELECT COALESCE(MAX(violation_id), 0) FROM violation"
+            ).fetchone()[0]
+            if len(violation_data) >= stored:
+                rebuild = conn.execute(
+                    """
+                    SELECT name, sql FROM sqlite_master
+                    WHERE type = 'index' AND tbl_name = 'violation' AND sql IS NOT NULL
+                    """
+                ).fetchall()
+                for name, _ in rebuild:
+                    conn.execute(f'DROP INDEX {name};')
+        
+        # One statement inserting _ROWS_PER_INSERT rows runs as a single VDBE
+        # program, about twice as fast as executemany's row-at-a-time loop
+        multi_row_sql = (
+            "INSERT INTO violation (scenario_id, tstamp, type, details) VALUES "
+            + ", ".join(["(?, ?, ?, ?)"] * _ROWS_PER_INSERT)
         )
-        if not cursor.fetchone():
-            raise ValueError(f"Scenario with ID {scenario_id} does not exist")
         
-        # Prepare violation data
-        violation_data = [
-            (scenario_id, viol['time'], viol['type'], viol['details'])
-            for viol in violations
-        ]
+        # Insert all violations in a single transaction, a chunk at a time
+        # so each batch of dirty pages fits in the page cache
+        for start in range(0, len(violation_data), _INSERT_CHUNK):
+            chunk = violation_data[start:start + _INSERT_CHUNK]
+            full = len(chunk) - len(chunk) % _ROWS_PER_INSERT
+            
+            for i in range(0, full, _ROWS_PER_INSERT):
+                params = list(chain.from_iterable(chunk[i:i + _ROWS_PER_INSERT]))
+                conn.execute(multi_row_sql, params)
+            
+            # Leftover rows that don't fill a multi-row statement
+            if full < len(chunk):
+                conn.executemany(
+                    """
+                    INSERT INTO violation (scenario_id, tstamp, type, details)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    chunk[full:]
+                )
         
-        # Insert all violations in a single transaction
+        for _, sql in rebuild:
+            conn.execute(sql)
+        
+        # Keep the per-type totals in step, in the same transaction
         conn.executemany(
             """
-            INSERT INTO violation (scenario_id, tstamp, type, details)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO violation_counts (scenario_id, type, cnt)
+            VALUES (?, ?, ?)
+            ON CONFLICT (scenario_id, type) DO UPDATE SET cnt = cnt + excluded.cnt
             """,
-            violation_data
+            (
+                (scenario_id, vtype, cnt)
+                for vtype, cnt in Counter(row[2] for row in violation_data).items()
+            )
         )
-        
-        conn.commit()
-        
-    except sqlite3.Error as e:
-        conn.rollback()
-        raise e
 
 
 def get_violation_counts(scenario_id: int) -> Dict[str, int]:
@@ -242,35 +580,39 @@ def get_violation_counts(scenario_id: int) -> Dict[str, int]:
     Returns:
         Dictionary where keys are violation types (str) and values are counts (int).
         Example: {"SPEEDING": 2, "TAILGATING": 1}
+        The result is cached until save_report next writes to this scenario.
         
     Raises:
         ValueError: If scenario_id is invalid
         sqlite3.Error: If there's a database error
     """
-    conn = _conn()
-    
-    # Verify the scenario exists
-    cursor = conn.execute(
-        "SELECT 1 FROM scenario WHERE scenario_id = ?",
-        (scenario_id,)
-    )
-    if not cursor.fetchone():
-        raise ValueError(f"Scenario with ID {scenario_id} does not exist")
+    cached = _cache_get(_COUNTS_CACHE, scenario_id)
+    if cached is not None:
+        return dict(cached)
     
-    # Get violation counts by type
-    cursor = conn.execute(
-        """
-        SELECT type, COUNT(*) as count 
-        FROM violation 
-        WHERE scenario_id = ? 
-        GROUP BY type
-        ORDER BY count DESC
-        """,
-        (scenario_id,)
-    )
+    generation = _cache_generation(scenario_id)
+    with _reader_conn() as conn:
+        # Get violation counts by type from the totals save_report maintains,
+        # so this reads one row per type instead of every violation
+        cursor = conn.execute(
+            """
+            SELECT type, cnt as count 
+            FROM violation_counts 
+            WHERE scenario_id = ? 
+            ORDER BY count DESC
+            """,
+            (scenario_id,)
+        )
+        
+        # Convert to dictionary
+        counts = dict(cursor.fetchall())
+        
+        # Only an empty result needs telling apart from an unknown scenario
+        if not counts:
+            _require_scenario(conn, scenario_id)
     
-    # Convert to dictionary
-    return {row['type']: row['count'] for row in cursor}
+    _cache_put(_COUNTS_CACHE, scenario_id, counts, scenario_id, generation)
+    return dict(counts)
 
 
 def get_violations_by_type(scenario_id: int, vtype: str) -> List[Dict[str, Any]]:
@@ -286,44 +628,118 @@ def get_violations_by_type(scenario_id: int, vtype: str) -> List[Dict[str, Any]]
         - 'time': Timestamp in 'MM:SS.s' format (str)
         - 'type': Type of violation (str)
         - 'details': Description of the violation (str)
+        The result is cached until save_report next writes to this scenario.
         
     Raises:
         ValueError: If scenario_id is invalid or vtype is empty
         sqlite3.Error: If there's a database error
     """
+    key = (scenario_id, vtype)
+    cached = _cache_get(_BYTYPE_CACHE, key)
+    if cached is None:
+        generation = _cache_generation(scenario_id)
+        cached = list(get_violations_by_type_iter(scenario_id, vtype))
+        _cache_put(_BYTYPE_CACHE, key, cached, scenario_id, generation)
+    
+    # Callers get their own copies so they cannot edit the cached result
+    return [dict(violation) for violation in cached]
+
+
+def get_violations_by_type_iter(scenario_id: int, vtype: str) -> Iterator[Dict[str, Any]]:
+    """
+    Like get_violations_by_type, but yield each violation as SQLite returns it.
+
+    The reader connection stays checked out of the pool until the iterator is
+    exhausted or closed, so consume it promptly; once the pool is empty,
+    further reads each open (and close) a temporary connection.
+
+    Args:
+        scenario_id: ID of the scenario to get violations for
+        vtype: Type of violation to filter by (e.g., 'SPEEDING', 'TAILGATING')
+        
+    Returns:
+        Iterator over violation dictionaries shaped as in get_violations_by_type
+        
+    Raises:
+        ValueError: If vtype is empty (immediately), or if scenario_id is
+                    invalid (when iteration finds no rows)
+        sqlite3.Error: If there's a database error
+    """
     if not vtype:
         raise ValueError("Violation type cannot be empty")
     
-    conn = _conn()
-    
-    # Verify the scenario exists
-    cursor = conn.execute(
-        "SELECT 1 FROM scenario WHERE scenario_id = ?",
-        (scenario_id,)
-    )
-    if not cursor.fetchone():
-        raise ValueError(f"Scenario with ID {scenario_id} does not exist")
+    return _iter_violations_by_type(scenario_id, vtype)
+
+
+def _iter_violations_by_type(scenario_id: int, vtype: str) -> Iterator[Dict[str, Any]]:
+    """Internal: generator behind get_violations_by_type_iter."""
+    with _reader_conn() as conn:
+        # Get violations of the specified type
+        cursor = conn.execute(
+            """
+            SELECT tstamp, details
+            FROM violation
+            WHERE scenario_id = ? AND type = ?
+            ORDER BY tstamp
+            """,
+            (scenario_id, vtype)
+        )
+        
+        found = False
+        for row in cursor:
+            found = True
+            yield {
+                'time': row[0],
+                'type': vtype,
+                'details': row[1]
+            }
+        
+        if not found:
+            _require_scenario(conn, scenario_id)
+
+
+def get_violations_by_type_columnar(scenario_id: int, vtype: str) -> Dict[str, List[Any]]:
+    """
+    Like get_violations_by_type, but return one list per field instead of one
+    dict per violation.
+
+    Useful for callers that aggregate or export a field at a time; it avoids
+    building a separate dict for every row.
+
+    Args:
+        scenario_id: ID of the scenario to get violations for
+        vtype: Type of violation to filter by (e.g., 'SPEEDING', 'TAILGATING')
+        
+    Returns:
+        Dictionary with equal-length lists, in tstamp order:
+        - 'time': Timestamps in 'MM:SS.s' format (str)
+        - 'type': The violation type, repeated (str)
+        - 'details': Descriptions of the violations (str)
+        
+    Raises:
+        ValueError: If scenario_id is invalid or vtype is empty
+        sqlite3.Error: If there's a database error
+    """
+    if not vtype:
+        raise ValueError("Violation type cannot be empty")
     
-    # Get violations of the specified type
-    cursor = conn.execute(
-        """
-        SELECT tstamp, details
-        FROM violation
-        WHERE scenario_id = ? AND type = ?
-        ORDER BY tstamp
-        """,
-        (scenario_id, vtype)
-    )
+    with _reader_conn() as conn:
+        rows = conn.execute(
+            """
+            SELECT tstamp, details
+            FROM violation
+            WHERE scenario_id = ? AND type = ?
+            ORDER BY tstamp
+            """,
+            (scenario_id, vtype)
+        ).fetchall()
+        
+        if not rows:
+            _require_scenario(conn, scenario_id)
+            return {'time': [], 'type': [], 'details': []}
     
-    # Convert to list of dictionaries with the required structure
-    return [
-        {
-            'time': row['tstamp'],
-            'type': vtype,
-            'details': row['details']
-        }
-        for row in cursor
-    ]
+    times, details = map(list, zip(*rows))
+    return {'time': times, 'type': [vtype] * len(times), 'details': details}
 
 
 def get_recent_violations(limit: int = 20) -> List[Dict[str, Any]]:
@@ -348,33 +764,87 @@ def get_recent_violations(limit: int = 20) -> List[Dict[str, Any]]:
     if not isinstance(limit, int) or limit <= 0:
         raise ValueError("Limit must be a positive integer")
     
-    conn = _conn()
-    
-    # Get recent violations with scenario information
-    cursor = conn.execute(
-        """
-        SELECT 
-            v.scenario_id, 
-            s.name as scenario_name, 
-            v.tstamp, 
-            v.type, 
-            v.details
-        FROM violation v
-        JOIN scenario s ON v.scenario_id = s.scenario_id
-        ORDER BY v.created_at DESC, v.violation_id DESC
-        LIMIT ?
-        """,
-        (limit,)
-    )
+    with _reader_conn() as conn:
+        # Get recent violations with scenario information
+        cursor = conn.execute(
+            """
+            SELECT 
+                v.scenario_id, 
+                s.name as scenario_name, 
+                v.tstamp, 
+                v.type, 
+                v.details
+            FROM violation v
+            JOIN scenario s ON v.scenario_id = s.scenario_id
+            ORDER BY v.created_at DESC, v.violation_id DESC
+            LIMIT ?
+            """,
+            (limit,)
+        )
+        
+        # Convert to list of dictionaries with the required structure
+        return [
+            {
+                'scenario_id': row[0],
+                'scenario_name': row[1],
+                'time': row[2],
+                'type': row[3],
+                'details': row[4]
+            }
+            for row in cursor
+        ]
+
+
+def get_summary_counts(limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Return per-type violation counts for the `limit` most recently registered scenarios.
+
+    The counts come from the violation_counts totals, so only one row per
+    (scenario, type) pair is read instead of every violation row.
+
+    Args:
+        limit: Number of most recent scenarios to summarize (default: 10)
+        
+    Returns:
+        List of dictionaries, newest scenario first, each with:
+        - 'scenario_id': ID of the scenario (int)
+        - 'scenario_name': Name of the scenario (str)
+        - 'type': Type of violation (str)
+        - 'count': Number of violations of that type (int)
+        
+    Raises:
+        ValueError: If limit is not a positive integer
+        sqlite3.Error: If there's a database error
+    """
+    if not isinstance(limit, int) or limit <= 0:
+        raise ValueError("Limit must be a positive integer")
     
-    # Convert to list of dictionaries with the required structure
-    return [
-        {
-            'scenario_id': row['scenario_id'],
-            'scenario_name': row['scenario_name'],
-            'time': row['tstamp'],
-            'type': row['type'],
-            'details': row['details']
-        }
-        for row in cursor
-    ]
+    with _reader_conn() as conn:
+        cursor = conn.execute(
+            """
+            SELECT 
+                s.scenario_id, 
+                s.name as scenario_name, 
+                c.type, 
+                c.cnt as count
+            FROM (
+                SELECT scenario_id, name
+                FROM scenario
+                ORDER BY scenario_id DESC
+                LIMIT ?
+            ) s
+            JOIN violation_counts c ON c.scenario_id = s.scenario_id
+            ORDER BY s.scenario_id DESC, c.type
+            """,
+            (limit,)
+        )
+        
+        return [
+            {
+                'scenario_id': row[0],
+                'scenario_name': row[1],
+                'type': row[2],
+                'count': row[3]
+            }
+            for row in cursor
+        ]
@@ -0,0 +1,15 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: large-input test, only run with `-m slow`")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Slow tests are opt-in: skip them unless a -m expression was given
+    if config.option.markexpr:
+        return
+    skip_slow = pytest.mark.skip(reason="slow test; run with -m slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
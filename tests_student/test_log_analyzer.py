@@ -0,0 +1,123 @@
+import json
+import pytest
+from pathlib import Path
+
+# Import the module to test
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import log_analyzer
+import storage
+
+# Test data
+SCENARIO = {
+    "name": "Batch Scenario",
+    "road_rules": {
+        "max_speed": 30.0,
+        "min_follow_distance": 2.0,
+        "stop_sign_wait": 3.0
+    }
+}
+
+GOOD_LOG = "0:00.0 SPEED 35.0\n0:01.0 FOLLOW_DISTANCE 1.5\n"
+
+
+@pytest.fixture
+def batch_dir(tmp_path, monkeypatch):
+    """A directory holding a scenario and two logs; reports are written into it."""
+    (tmp_path / "scenario.json").write_text(json.dumps(SCENARIO))
+    (tmp_path / "good.log").write_text(GOOD_LOG)
+    (tmp_path / "short.log").write_text("0:00.0 SPEED 40.0\n")
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    storage.close_db()
+
+
+def write_batch(path: Path, *lines: str) -> Path:
+    """Helper to write a batch file with the given lines."""
+    batch = path / "runs.txt"
+    batch.write_text("".join(line + "\n" for line in lines))
+    return batch
+
+
+def load_report(path: Path) -> dict:
+    """Helper to read a report file written by the analyzer."""
+    return json.loads(path.read_text())
+
+
+class TestReadBatch:
+    """Test the read_batch function."""
+
+    def test_read_batch_skips_comments_and_blank_lines(self, batch_dir):
+        """Test that each remaining line becomes a (scenario, log) pair."""
+        batch = write_batch(batch_dir, "# runs", "", "scenario.json good.log", "  scenario.json short.log  ")
+        assert log_analyzer.read_batch(batch) == [
+            (Path("scenario.json"), Path("good.log")),
+            (Path("scenario.json"), Path("short.log")),
+        ]
+
+    def test_read_batch_bad_line(self, batch_dir):
+        """Test that a line without exactly two paths is rejected with its number."""
+        batch = write_batch(batch_dir, "scenario.json good.log", "scenario.json")
+        with pytest.raises(ValueError, match="line 2"):
+            log_analyzer.read_batch(batch)
+
+
+class TestRunBatch:
+    """Test batch mode (--batch)."""
+
+    def test_batch_writes_a_report_per_run(self, batch_dir):
+        """Test that every run gets its own numbered report."""
+        batch = write_batch(batch_dir, "scenario.json good.log", "scenario.json short.log")
+        assert log_analyzer.main(["--batch", str(batch)]) == 0
+
+        first = load_report(batch_dir / "report_1.json")
+        assert first["scenario"] == "Batch Scenario"
+        assert [v["type"] for v in first["violations"]] == ["SPEEDING", "TAILGATING"]
+        assert load_report(batch_dir / "report_2.json")["total_violations"] == 1
+
+    def test_batch_bad_batch_line(self, batch_dir):
+        """Test that a malformed batch file is a usage error and runs nothing."""
+        batch = write_batch(batch_dir, "scenario.json good.log extra")
+        assert log_analyzer.main(["--batch", str(batch)]) == 2
+        assert not (batch_dir / "report_1.json").exists()
+
+    def test_batch_failing_log_does_not_stop_others(self, batch_dir):
+        """Test that a run that fails to analyze is reported while the rest still finish."""
+        (batch_dir / "bad.log").write_text("0:00.0 HONK\n")
+        batch = write_batch(batch_dir, "scenario.json bad.log", "scenario.json good.log")
+        assert log_analyzer.main(["--batch", str(batch)]) == 1
+
+        assert not (batch_dir / "report_1.json").exists()
+        assert load_report(batch_dir / "report_2.json")["total_violations"] == 2
+
+    def test_batch_saves_every_run_to_db(self, batch_dir):
+        """Test that --db stores each run as its own scenario and closes the DB."""
+        batch = write_batch(batch_dir, "scenario.json good.log", "scenario.json short.log")
+        db_path = str(batch_dir / "runs.db")
+        assert log_analyzer.main(["--batch", str(batch), "--db", db_path]) == 0
+        assert storage._WRITER is None
+
+        storage.init_db(db_path)
+        counts = [storage.get_violation_counts(scenario_id) for scenario_id in (1, 2)]
+        assert counts == [{"SPEEDING": 1, "TAILGATING": 1}, {"SPEEDING": 1}]
+
+    def test_batch_failed_save_does_not_stop_others(self, batch_dir, monkeypatch):
+        """Test that a run whose save fails is reported while the rest are still saved."""
+        save_run = log_analyzer.save_run
+        calls = []
+
+        def flaky_save_run(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("disk full")
+            return save_run(*args)
+
+        monkeypatch.setattr(log_analyzer, "save_run", flaky_save_run)
+        batch = write_batch(batch_dir, "scenario.json good.log", "scenario.json short.log")
+        db_path = str(batch_dir / "runs.db")
+        assert log_analyzer.main(["--batch", str(batch), "--db", db_path]) == 1
+        assert len(calls) == 2
+
+        storage.init_db(db_path)
+        assert storage.get_violation_counts(1) == {"SPEEDING": 1}
@@ -1,3 +1,4 @@
+import io
 import json
 import pytest
 from pathlib import Path
@@ -42,53 +43,89 @@ SAMPLE_LOG_LINES = [
 ]
 
 
+# The sample files are only read, never modified, so each is written once
+# per module instead of once per test
+@pytest.fixture(scope="module")
+def sample_scenario_path(tmp_path_factory) -> Path:
+    """Path to SAMPLE_SCENARIO written as JSON."""
+    path = tmp_path_factory.mktemp("scenario") / "scenario.json"
+    path.write_text(json.dumps(SAMPLE_SCENARIO))
+    return path
+
+
+@pytest.fixture(scope="module")
+def sample_scenario_no_zones_path(tmp_path_factory) -> Path:
+    """Path to SAMPLE_SCENARIO_NO_ZONES written as JSON."""
+    path = tmp_path_factory.mktemp("scenario") / "scenario_no_zones.json"
+    path.write_text(json.dumps(SAMPLE_SCENARIO_NO_ZONES))
+    return path
+
+
+@pytest.fixture(scope="module")
+def sample_log_path(tmp_path_factory) -> Path:
+    """Path to SAMPLE_LOG_LINES written as a log file."""
+    path = tmp_path_factory.mktemp("log") / "test.log"
+    path.write_text("".join(SAMPLE_LOG_LINES))
+    return path
+
+
+BIG_LOG_LINES = 1_000_000
+
+
+@pytest.fixture(scope="session")
+def big_log_path(tmp_path_factory) -> Path:
+    """Path to a BIG_LOG_LINES-line SPEED log (0.1 s apart), built in memory and written once."""
+    path = tmp_path_factory.mktemp("log") / "big.log"
+    path.write_text("".join(
+        f"{t // 600}:{t % 600 // 10:02d}.{t % 10} SPEED 30.0\n" for t in range(BIG_LOG_LINES)
+    ))
+    return path
+
+
 class TestParseTime:
     """Test the parse_time function."""
     
-    def test_parse_time_valid(self):
+    @pytest.mark.parametrize("ts, expected", [
+        ("0:00.0", 0.0),
+        ("1:23.4", 83.4),
+        ("0:59.9", 59.9),
+        ("5:00.1", 300.1),
+        ("0:05", 5.0),
+        (" 1:05.0 ", 65.0),  # Surrounding whitespace
+    ])
+    def test_parse_time_valid(self, ts, expected):
         """Test parsing valid time strings."""
-        assert parse_time("0:00.0") == 0.0
-        assert parse_time("1:23.4") == 83.4
-        assert parse_time("0:59.9") == 59.9
-        assert parse_time("5:00.1") == 300.1
+        assert parse_time(ts) == expected
     
-    def test_parse_time_invalid_format(self):
+    @pytest.mark.parametrize("ts", [
+        "1:60.0",      # Seconds too high
+        "-1:00.0",     # Negative minutes
+        "1:-10.0",     # Negative seconds
+        "1:00.999",    # Too many decimal places
+        "not a time",  # Not a time string
+        "1:2:03.0",    # Extra colon
+    ])
+    def test_parse_time_invalid_format(self, ts):
         """Test parsing invalid time formats."""
         with pytest.raises(ValueError):
-            parse_time("1:60.0")  # Seconds too high
-        with pytest.raises(ValueError):
-            parse_time("-1:00.0")  # Negative minutes
-        with pytest.raises(ValueError):
-            parse_time("1:-10.0")  # Negative seconds
-        with pytest.raises(ValueError):
-            parse_time("1:00.999")  # Too many decimal places
-        with pytest.raises(ValueError):
-            parse_time("not a time")  # Not a time string
+            parse_time(ts)
 
 
 class TestLoadScenario:
     """Test the load_scenario function."""
     
-    def test_load_scenario_valid(self, tmp_path):
+    def test_load_scenario_valid(self, sample_scenario_path):
         """Test loading a valid scenario file."""
-        # Create a temporary scenario file
-        scenario_file = tmp_path / "scenario.json"
-        scenario_file.write_text(json.dumps(SAMPLE_SCENARIO))
-        
         # Load and verify the scenario
-        scenario = load_scenario(scenario_file)
+        scenario = load_scenario(sample_scenario_path)
         assert scenario["name"] == "Test Scenario"
         assert scenario["road_rules"]["max_speed"] == 35.0
         assert len(scenario["speed_zones"]) == 2
     
-    def test_load_scenario_no_zones(self, tmp_path):
+    def test_load_scenario_no_zones(self, sample_scenario_no_zones_path):
         """Test loading a scenario with no speed zones."""
-        # Create a temporary scenario file with no speed_zones
-        scenario_file = tmp_path / "scenario_no_zones.json"
-        scenario_file.write_text(json.dumps(SAMPLE_SCENARIO_NO_ZONES))
-        
         # Load and verify the scenario
-        scenario = load_scenario(scenario_file)
+        scenario = load_scenario(sample_scenario_no_zones_path)
         assert scenario["name"] == "Test Scenario No Zones"
         assert "speed_zones" in scenario
         assert scenario["speed_zones"] == []  # Should be empty list, not missing
@@ -115,32 +152,36 @@ class TestLoadScenario:
         
         with pytest.raises(ValueError, match="missing key: stop_sign_wait"):
             load_scenario(scenario_file)
+    
+    def test_load_scenario_invalid_json(self, tmp_path):
+        """Test loading a scenario file that is not valid JSON."""
+        scenario_file = tmp_path / "broken.json"
+        scenario_file.write_text('{"road_rules": ')
+        
+        with pytest.raises(json.JSONDecodeError, match="Invalid JSON in scenario file"):
+            load_scenario(scenario_file)
 
 
 class TestReadLog:
     """Test the read_log function."""
     
-    def test_read_log_valid(self, tmp_path):
+    def test_read_log_valid(self, sample_log_path):
         """Test reading a valid log file."""
-        # Create a temporary log file
-        log_file = tmp_path / "test.log"
-        log_file.write_text("".join(SAMPLE_LOG_LINES))
-        
         # Read and verify the log
-        events = list(read_log(log_file))
+        events = list(read_log(sample_log_path))
         assert len(events) == 4
         
         # Check the first event (SPEED)
         time1, type1, arg1 = events[0]
         assert time1 == 0.5
         assert type1 == "SPEED"
-        assert arg1 == "32.5"
+        assert arg1 == 32.5
         
         # Check the second event (FOLLOW_DISTANCE)
         time2, type2, arg2 = events[1]
         assert time2 == 1.0
         assert type2 == "FOLLOW_DISTANCE"
-        assert arg2 == "1.8"
+        assert arg2 == 1.8
         
         # Check the third event (LANE_CHANGE)
         time3, type3, arg3 = events[2]
@@ -154,13 +195,18 @@ class TestReadLog:
         assert type4 == "STOP_SIGN_DETECTED"
         assert arg4 == ""
     
-    def test_read_log_invalid_time(self, tmp_path):
+    def test_read_log_from_stream(self, sample_log_path):
+        """Test that text and binary file-like objects parse like the file itself."""
+        expected = list(read_log(sample_log_path))
+        assert list(read_log(io.StringIO("".join(SAMPLE_LOG_LINES)))) == expected
+        assert list(read_log(io.BytesIO("".join(SAMPLE_LOG_LINES).encode()))) == expected
+    
+    def test_read_log_invalid_time(self):
         """Test reading a log file with an invalid time format."""
-        log_file = tmp_path / "invalid_time.log"
-        log_file.write_text("1:60.0 SPEED 30.0\n")  # Invalid time (seconds > 59)
+        log = io.StringIO("1:60.0 SPEED 30.0\n")  # Invalid time (seconds > 59)
         
-        with pytest.raises(ValueError):
-            list(read_log(log_file))
+        with pytest.raises(ValueError, match="'<stream>', line 1"):
+            list(read_log(log))
     
     def test_read_log_missing_file(self):
         """Test reading a non-existent log file."""
@@ -172,5 +218,44 @@ class TestReadLog:
         log_file = tmp_path / "empty.log"
         log_file.touch()  # Create empty file
         
-        events = list(read_log(log_file))
-        assert events == []  # Should return empty list, not raise
\ No newline at end of file
+        # Should yield nothing, not raise; next() stops at the first event
+        assert next(read_log(log_file), None) is None
+    
+    def test_read_log_malformed_lines(self):
+        """Test that malformed lines are rejected with the offending line number."""
+        for text in ("0:01.0 SPEED\n",
+                     "0:01.0 LANE_CHANGE UP\n",
+                     "0:01.0 STOP_SIGN_DETECTED NOW\n",
+                     "0:01.0 HONK\n",
+                     "0:01.0 SPEED 30.0 extra\n"):
+            log = io.StringIO("0:00.0 SPEED 10.0\n" + text)
+            with pytest.raises(ValueError, match="line 2"):
+                list(read_log(log))
+    
+    @pytest.mark.slow
+    def test_read_log_big_file(self, big_log_path):
+        """Test that read_log streams a large log through to its last event."""
+        count = 0
+        last = None
+        for last in read_log(big_log_path):
+            count += 1
+        assert count == BIG_LOG_LINES
+        assert last == ((BIG_LOG_LINES - 1) / 10, "SPEED", 30.0)
+    
+    def test_read_log_comments_and_blank_lines(self, tmp_path):
+        """Test that comments/blank lines are skipped but still count toward line numbers."""
+        log_file = tmp_path / "comments.log"
+        log_file.write_bytes(b"# header\r\n\r\n0:00.5 SPEED 32.5\r\n  # indented\n0:01.0 LANE_CHANGE LEFT")
+        
+        assert list(read_log(log_file)) == [(0.5, "SPEED", 32.5), (1.0, "LANE_CHANGE", "LEFT")]
+        
+        log_file.write_bytes(b"# header\r\r0:00.5 SPEED 32.5\r  # indented\r0:01.0 LANE_CHANGE LEFT\r")
+        assert list(read_log(log_file)) == [(0.5, "SPEED", 32.5), (1.0, "LANE_CHANGE", "LEFT")]
+        
+        log_file.write_bytes(b"0:00.0 SPEED 30.0\r\n0:01.0 SPEED 40.0\r0:02.0 SPEED slow\n")
+        with pytest.raises(ValueError, match="line 3: .*Invalid numeric value: slow"):
+            list(read_log(log_file))
+        
+        log_file.write_text("# header\n\n0:00.5 SPEED 32.5\n# note\n0:01.0 SPEED fast\n")
+        with pytest.raises(ValueError, match="line 5: .*Invalid numeric value: fast"):
+            list(read_log(log_file))
@@ -105,6 +105,17 @@ def test_safe_stop_no_violation():
     violations = detect_violations(scenario, events)
     assert len(violations) == 0
 
+def test_stop_exactly_required_wait_no_violation():
+    """Test that waiting exactly stop_sign_wait seconds is a full stop."""
+    scenario = create_scenario(stop_wait=3.0)
+    events = [
+        (0.0, "STOP_SIGN_DETECTED", ""),
+        (1.0, "SPEED", "0.0"),
+        (3.0, "SPEED", "2.0"),  # Waited exactly 3s
+    ]
+    violations = detect_violations(scenario, events)
+    assert len(violations) == 0
+
 # Test cases for UNSAFE_LANE_CHANGE violation
 def test_unsafe_lane_change_after_close_follow():
     """Test unsafe lane change after close follow."""
@@ -142,6 +153,26 @@ def test_ordering_of_violations_is_time_non_decreasing():
     assert "TAILGATING" in violations[0]["type"] or "TAILGATING" in violations[1]["type"]
     assert "SPEEDING" in violations[0]["type"] or "SPEEDING" in violations[1]["type"]
 
+def test_ordering_past_99_minutes_is_numeric():
+    """Test that ordering follows elapsed time, not the formatted string."""
+    scenario = create_scenario(max_speed=30.0)
+    events = [
+        (6000.0, "SPEED", "35.0"),  # 100:00.0
+        (1200.0, "SPEED", "35.0"),  # 20:00.0
+    ]
+    violations = detect_violations(scenario, events)
+    assert [v["time"] for v in violations] == ["20:00.0", "100:00.0"]
+
+def test_time_rounding_carries_into_next_minute():
+    """Test that a time rounding up to 60.0s is shown as the next minute."""
+    scenario = create_scenario(max_speed=30.0)
+    events = [
+        (59.96, "SPEED", "35.0"),
+        (62.5, "SPEED", "35.0"),
+    ]
+    violations = detect_violations(scenario, events)
+    assert [v["time"] for v in violations] == ["01:00.0", "01:02.5"]
+
 def test_no_false_positive_on_normal_driving():
     """Test no violations are reported for normal driving."""
     scenario = create_scenario(max_speed=35.0, min_follow=5.0, stop_wait=3.0)
@@ -0,0 +1,453 @@
+import pytest
+import sqlite3
+from typing import Any, Dict, List
+
+# Import the module to test
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import storage
+
+# Test data
+SAMPLE_RULES = {
+    "max_speed": 35.0,
+    "min_follow_distance": 2.0,
+    "stop_sign_wait": 3.0
+}
+
+
+def make_violations(*types: str) -> List[Dict[str, Any]]:
+    """Helper to build violation dicts of the given types, one second apart."""
+    return [
+        {"type": vtype, "time": f"00:{i:02d}.0", "details": f"detail {i}"}
+        for i, vtype in enumerate(types)
+    ]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Initialize a fresh database for each test."""
+    storage.init_db(str(tmp_path / "test.db"))
+    yield storage._conn()
+    storage.close_db()
+
+
+def register(name: str) -> int:
+    """Helper to register a scenario under the sample ruleset."""
+    rule_id = storage.upsert_ruleset(SAMPLE_RULES)
+    return storage.register_scenario(
+        name=name, description="", source_file=f"{name}.json", rule_id=rule_id
+    )
+
+
+class TestRecentViolations:
+    """Test the get_recent_violations function."""
+    
+    def test_recent_violations_newest_first(self, db):
+        """Test that the latest rows come first, with their scenario names."""
+        first = register("First")
+        second = register("Second")
+        storage.save_report(first, make_violations("SPEEDING"))
+        storage.save_report(second, make_violations("TAILGATING", "ROLLING_STOP"))
+        
+        rows = storage.get_recent_violations(2)
+        assert rows == [
+            {"scenario_id": second, "scenario_name": "Second", "time": "00:01.0",
+             "type": "ROLLING_STOP", "details": "detail 1"},
+            {"scenario_id": second, "scenario_name": "Second", "time": "00:00.0",
+             "type": "TAILGATING", "details": "detail 0"},
+        ]
+
+
+class TestSummaryCounts:
+    """Test the get_summary_counts function."""
+    
+    def test_summary_counts_grouped_per_scenario(self, db):
+        """Test that counts are grouped by scenario and type, newest first."""
+        first = register("First")
+        second = register("Second")
+        storage.save_report(first, make_violations("SPEEDING", "SPEEDING", "TAILGATING"))
+        storage.save_report(second, make_violations("ROLLING_STOP"))
+        
+        rows = storage.get_summary_counts(10)
+        assert [(r["scenario_id"], r["type"], r["count"]) for r in rows] == [
+            (second, "ROLLING_STOP", 1),
+            (first, "SPEEDING", 2),
+            (first, "TAILGATING", 1),
+        ]
+        assert rows[0]["scenario_name"] == "Second"
+    
+    def test_summary_counts_limits_runs(self, db):
+        """Test that only the N most recent scenarios are summarized."""
+        first = register("First")
+        second = register("Second")
+        storage.save_report(first, make_violations("SPEEDING"))
+        storage.save_report(second, make_violations("TAILGATING"))
+        
+        rows = storage.get_summary_counts(1)
+        assert {r["scenario_id"] for r in rows} == {second}
+    
+    def test_summary_counts_invalid_limit(self, db):
+        """Test that a non-positive limit is rejected."""
+        with pytest.raises(ValueError):
+            storage.get_summary_counts(0)
+
+
+class TestInitDb:
+    """Test the connection settings applied by init_db."""
+    
+    def test_init_db_uses_wal(self, db):
+        """Test that the database is opened in WAL mode with relaxed fsync."""
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert db.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    
+    def test_readers_see_committed_writes_and_cannot_write(self, db):
+        """Test that pooled readers see the writer's commits but are read-only."""
+        scenario_id = register("Pooled")
+        storage.save_report(scenario_id, make_violations("SPEEDING"))
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 1}
+        
+        with storage._reader_conn() as reader:
+            assert reader is not db
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("DELETE FROM violation")
+
+
+class TestQueryPlans:
+    """Test that the read queries are served by indexes without a sort step."""
+    
+    def plan(self, db, sql, params):
+        return " | ".join(row[3] for row in db.execute("EXPLAIN QUERY PLAN " + sql, params))
+    
+    def test_recent_violations_use_index_order(self, db):
+        """Test that newest-first order comes straight from an index."""
+        plan = self.plan(
+            db,
+            """
+            SELECT v.scenario_id, s.name, v.tstamp, v.type, v.details
+            FROM violation v
+            JOIN scenario s ON v.scenario_id = s.scenario_id
+            ORDER BY v.created_at DESC, v.violation_id DESC
+            LIMIT ?
+            """,
+            (20,)
+        )
+        assert "idx_violation_recent" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_violations_by_type_use_index_order(self, db):
+        """Test that by-type results come back in tstamp order without sorting."""
+        plan = self.plan(
+            db,
+            """
+            SELECT tstamp, details FROM violation
+            WHERE scenario_id = ? AND type = ?
+            ORDER BY tstamp
+            """,
+            (1, "SPEEDING")
+        )
+        assert "idx_violation_scenario_type_time" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestUpsertRuleset:
+    """Test the upsert_ruleset function."""
+    
+    def test_upsert_ruleset_reuses_existing_row(self, db):
+        """Test that the same rules map to one rule_id and new rules get another."""
+        first = storage.upsert_ruleset(SAMPLE_RULES)
+        assert storage.upsert_ruleset(dict(SAMPLE_RULES)) == first
+        assert storage.upsert_ruleset({**SAMPLE_RULES, "max_speed": 40.0}) != first
+        assert db.execute("SELECT COUNT(*) FROM ruleset").fetchone()[0] == 2
+    
+    def test_upsert_ruleset_matches_within_tolerance(self, db):
+        """Test that values differing by float noise map to the same ruleset."""
+        first = storage.upsert_ruleset(SAMPLE_RULES)
+        storage._RULESET_CACHE.clear()  # force the SQL path
+        noisy = {**SAMPLE_RULES, "min_follow_distance": 2.0 + 1e-12}
+        assert storage.upsert_ruleset(noisy) == first
+    
+    @pytest.mark.parametrize("max_speed", [float("inf"), float("nan"), 1e10])
+    def test_upsert_ruleset_rejects_unquantizable_values(self, db, max_speed):
+        """Test that non-finite or out-of-range values raise ValueError, not OverflowError."""
+        with pytest.raises(ValueError, match="Invalid rule value"):
+            storage.upsert_ruleset({**SAMPLE_RULES, "max_speed": max_speed})
+    
+    def test_upsert_ruleset_migrates_old_database(self, tmp_path):
+        """Test that rulesets stored before the quantized columns are still found."""
+        path = tmp_path / "old.db"
+        old = sqlite3.connect(path)
+        old.executescript(
+            """
+            CREATE TABLE ruleset (
+                rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                max_speed REAL NOT NULL,
+                min_follow_distance REAL NOT NULL,
+                stop_sign_wait REAL NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(max_speed, min_follow_distance, stop_sign_wait)
+            );
+            INSERT INTO ruleset (max_speed, min_follow_distance, stop_sign_wait)
+            VALUES (35.0, 2.0, 3.0);
+            """
+        )
+        old.close()
+        
+        storage.init_db(str(path))
+        try:
+            assert storage.upsert_ruleset(SAMPLE_RULES) == 1
+        finally:
+            storage.close_db()
+    
+    def test_upsert_ruleset_cache_cleared_on_init(self, db, tmp_path):
+        """Test that rule_ids cached for one database are not reused for another."""
+        storage.upsert_ruleset({**SAMPLE_RULES, "max_speed": 99.0})
+        storage.upsert_ruleset(SAMPLE_RULES)
+        
+        storage.init_db(str(tmp_path / "other.db"))
+        rule_id = storage.upsert_ruleset(SAMPLE_RULES)
+        assert storage._conn().execute(
+            "SELECT max_speed FROM ruleset WHERE rule_id = ?", (rule_id,)
+        ).fetchone()[0] == SAMPLE_RULES["max_speed"]
+
+
+class TestRegisterScenario:
+    """Test the register_scenario function."""
+    
+    def test_register_scenario_with_zones(self, db):
+        """Test that the scenario and its zones are stored together."""
+        rule_id = storage.upsert_ruleset(SAMPLE_RULES)
+        zones = [
+            {"start_mile": 0.0, "end_mile": 1.0, "speed_limit": 25.0},
+            {"start_mile": 1.0, "end_mile": 2.0, "speed_limit": 45.0},
+        ]
+        scenario_id = storage.register_scenario("Zoned", "", "zoned.json", rule_id, zones)
+        
+        rows = db.execute(
+            "SELECT speed_limit FROM speed_zone WHERE scenario_id = ? ORDER BY start_mile",
+            (scenario_id,)
+        ).fetchall()
+        assert [row[0] for row in rows] == [25.0, 45.0]
+    
+    def test_register_scenario_rolls_back_on_bad_zone(self, db):
+        """Test that a failing zone insert leaves no half-registered scenario."""
+        rule_id = storage.upsert_ruleset(SAMPLE_RULES)
+        bad_zones = [{"start_mile": 2.0, "end_mile": 1.0, "speed_limit": 25.0}]
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            storage.register_scenario("Bad", "", "bad.json", rule_id, bad_zones)
+        assert db.execute("SELECT COUNT(*) FROM scenario").fetchone()[0] == 0
+        assert not db.in_transaction
+
+
+class TestSaveReport:
+    """Test the save_report function."""
+    
+    def test_save_report_in_chunks(self, db, monkeypatch):
+        """Test that reports larger than one insert chunk are stored in full."""
+        monkeypatch.setattr(storage, "_INSERT_CHUNK", 2)
+        scenario_id = register("Chunked")
+        storage.save_report(
+            scenario_id,
+            make_violations("SPEEDING", "SPEEDING", "TAILGATING", "SPEEDING", "ROLLING_STOP")
+        )
+        assert storage.get_violation_counts(scenario_id) == {
+            "SPEEDING": 3, "TAILGATING": 1, "ROLLING_STOP": 1
+        }
+    
+    def test_save_report_multi_row_inserts_keep_order(self, db, monkeypatch):
+        """Test that multi-row statements plus the leftover rows store every row in order."""
+        monkeypatch.setattr(storage, "_INSERT_CHUNK", 5)
+        monkeypatch.setattr(storage, "_ROWS_PER_INSERT", 2)
+        scenario_id = register("MultiRow")
+        violations = make_violations(*["SPEEDING"] * 12)
+        storage.save_report(scenario_id, violations)
+        
+        rows = db.execute(
+            "SELECT tstamp, details FROM violation WHERE scenario_id = ? ORDER BY violation_id",
+            (scenario_id,)
+        ).fetchall()
+        assert [(r[0], r[1]) for r in rows] == [(v["time"], v["details"]) for v in violations]
+    
+    def test_queries_distinguish_empty_from_unknown_scenario(self, db):
+        """Test that a scenario with no violations is not reported as missing."""
+        scenario_id = register("Clean")
+        assert storage.get_violation_counts(scenario_id) == {}
+        assert storage.get_violations_by_type(scenario_id, "SPEEDING") == []
+        
+        with pytest.raises(ValueError):
+            storage.get_violation_counts(999)
+        with pytest.raises(ValueError):
+            storage.get_violations_by_type(999, "SPEEDING")
+    
+    def test_violations_by_type_iter_streams_rows(self, db):
+        """Test that the streaming variant yields the same rows lazily."""
+        scenario_id = register("Streamed")
+        storage.save_report(scenario_id, make_violations("SPEEDING", "TAILGATING", "SPEEDING"))
+        
+        rows = storage.get_violations_by_type_iter(scenario_id, "SPEEDING")
+        assert next(rows) == {"time": "00:00.0", "type": "SPEEDING", "details": "detail 0"}
+        assert list(rows) == [{"time": "00:02.0", "type": "SPEEDING", "details": "detail 2"}]
+        assert storage.get_violations_by_type(scenario_id, "SPEEDING") == [
+            {"time": "00:00.0", "type": "SPEEDING", "details": "detail 0"},
+            {"time": "00:02.0", "type": "SPEEDING", "details": "detail 2"},
+        ]
+        
+        with pytest.raises(ValueError):
+            storage.get_violations_by_type_iter(scenario_id, "")
+    
+    def test_open_iterators_do_not_exhaust_reader_pool(self, db):
+        """Test that reads still run while every pooled reader is held by an iterator."""
+        scenario_id = register("Held")
+        storage.save_report(scenario_id, make_violations("SPEEDING", "SPEEDING"))
+        
+        held = [storage.get_violations_by_type_iter(scenario_id, "SPEEDING")
+                for _ in range(storage.READER_COUNT + 1)]
+        for rows in held:
+            next(rows)
+        assert storage._READERS.empty()
+        
+        # Would block forever waiting on the pool
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 2}
+        assert storage.get_violations_by_type_columnar(scenario_id, "SPEEDING")["details"] == [
+            "detail 0", "detail 1"
+        ]
+        
+        for rows in held:
+            rows.close()
+        assert storage._READERS.qsize() == storage.READER_COUNT
+    
+    def test_counts_accumulate_across_reports(self, db):
+        """Test that the maintained totals add up over several saves."""
+        scenario_id = register("Twice")
+        storage.save_report(scenario_id, make_violations("SPEEDING", "TAILGATING"))
+        storage.save_report(scenario_id, make_violations("SPEEDING"))
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 2, "TAILGATING": 1}
+    
+    def test_counts_backfilled_for_older_database(self, db, tmp_path):
+        """Test that init_db rebuilds missing totals from existing violations."""
+        scenario_id = register("Old")
+        storage.save_report(scenario_id, make_violations("SPEEDING", "SPEEDING"))
+        db.execute("DELETE FROM violation_counts")
+        
+        storage.init_db(str(tmp_path / "test.db"))
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 2}
+    
+    def test_save_report_missing_key(self, db):
+        """Test that a violation without a required key is rejected by index."""
+        scenario_id = register("Missing")
+        violations = make_violations("SPEEDING", "TAILGATING")
+        del violations[1]["details"]
+        
+        with pytest.raises(ValueError, match="index 1 missing keys: details"):
+            storage.save_report(scenario_id, violations)
+        assert storage.get_violation_counts(scenario_id) == {}
+    
+    def test_bulk_report_rebuilds_indexes(self, db, monkeypatch):
+        """Test that a bulk-sized report leaves the same indexes in place."""
+        monkeypatch.setattr(storage, "_BULK_INDEX_THRESHOLD", 3)
+        index_sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'violation'"
+        before = sorted(row[0] for row in db.execute(index_sql))
+        
+        scenario_id = register("Bulk")
+        storage.save_report(scenario_id, make_violations("SPEEDING", "TAILGATING", "SPEEDING"))
+        
+        assert sorted(row[0] for row in db.execute(index_sql)) == before
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 2, "TAILGATING": 1}
+        assert len(storage.get_violations_by_type(scenario_id, "SPEEDING")) == 2
+    
+    def test_violations_by_type_columnar(self, db):
+        """Test that the columnar variant holds the same data as the row variant."""
+        scenario_id = register("Columns")
+        storage.save_report(scenario_id, make_violations("SPEEDING", "TAILGATING", "SPEEDING"))
+        
+        assert storage.get_violations_by_type_columnar(scenario_id, "SPEEDING") == {
+            "time": ["00:00.0", "00:02.0"],
+            "type": ["SPEEDING", "SPEEDING"],
+            "details": ["detail 0", "detail 2"],
+        }
+        assert storage.get_violations_by_type_columnar(scenario_id, "ROLLING_STOP") == {
+            "time": [], "type": [], "details": []
+        }
+        with pytest.raises(ValueError):
+            storage.get_violations_by_type_columnar(999, "SPEEDING")
+    
+    def test_save_report_unknown_scenario(self, db):
+        """Test that saving to a missing scenario raises and writes nothing."""
+        with pytest.raises(ValueError):
+            storage.save_report(999, make_violations("SPEEDING"))
+        assert db.execute("SELECT COUNT(*) FROM violation").fetchone()[0] == 0
+        assert not db.in_transaction
+
+
+class TestResultCache:
+    """Test the cached read results."""
+    
+    def test_cached_results_refresh_after_save(self, db):
+        """Test that a new report for the scenario is visible on the next read."""
+        scenario_id = register("Cached")
+        storage.save_report(scenario_id, make_violations("SPEEDING"))
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 1}
+        assert len(storage.get_violations_by_type(scenario_id, "SPEEDING")) == 1
+        
+        storage.save_report(scenario_id, make_violations("SPEEDING"))
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 2}
+        assert len(storage.get_violations_by_type(scenario_id, "SPEEDING")) == 2
+    
+    def test_cached_results_are_copies(self, db):
+        """Test that editing a returned result does not change later reads."""
+        scenario_id = register("Copies")
+        storage.save_report(scenario_id, make_violations("SPEEDING"))
+        
+        storage.get_violation_counts(scenario_id)["SPEEDING"] = 99
+        storage.get_violations_by_type(scenario_id, "SPEEDING")[0]["details"] = "edited"
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 1}
+        assert storage.get_violations_by_type(scenario_id, "SPEEDING")[0]["details"] == "detail 0"
+    
+    def test_read_racing_a_save_is_not_cached(self, db, monkeypatch):
+        """Test that a read whose query ran before a concurrent save does not cache its result."""
+        scenario_id = register("Race")
+        storage.save_report(scenario_id, make_violations("SPEEDING"))
+        
+        # Run a save between each read's query and its _cache_put, as a
+        # writer thread could
+        cache_put = storage._cache_put
+        
+        def racing_cache_put(*args):
+            monkeypatch.setattr(storage, "_cache_put", cache_put)
+            storage.save_report(scenario_id, make_violations("SPEEDING"))
+            cache_put(*args)
+        
+        monkeypatch.setattr(storage, "_cache_put", racing_cache_put)
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 1}
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 2}
+        
+        monkeypatch.setattr(storage, "_cache_put", racing_cache_put)
+        assert len(storage.get_violations_by_type(scenario_id, "SPEEDING")) == 2
+        assert len(storage.get_violations_by_type(scenario_id, "SPEEDING")) == 3
+    
+    def test_cache_is_bounded(self, db, monkeypatch):
+        """Test that the least recently used entry is evicted when full."""
+        monkeypatch.setattr(storage, "_RESULT_CACHE_SIZE", 2)
+        ids = [register(f"S{i}") for i in range(3)]
+        for scenario_id in ids:
+            storage.get_violation_counts(scenario_id)
+        assert list(storage._COUNTS_CACHE) == ids[1:]
+
+
+class TestBulkLoad:
+    """Test the bulk_load context manager."""
+    
+    def test_bulk_load_restores_pragmas(self, db):
+        """Test that fsync is disabled inside the block and restored after."""
+        before = db.execute("PRAGMA synchronous").fetchone()[0]
+        scenario_id = register("Bulk")
+        
+        with storage.bulk_load():
+            assert db.execute("PRAGMA synchronous").fetchone()[0] == 0
+            assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            storage.save_report(scenario_id, make_violations("SPEEDING", "TAILGATING"))
+        
+        assert db.execute("PRAGMA synchronous").fetchone()[0] == before
+        assert storage.get_violation_counts(scenario_id) == {"SPEEDING": 1, "TAILGATING": 1}